@@ -0,0 +1,434 @@
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from db_utils import RDSDatabaseConnector
+from synthetic_data import generate_loan_payments, write_loan_payments_sqlite
+from transformation import LOAN_PAYMENTS_SCHEMA, DataFrameInfo, DataFrameTransform, DataTransform, NullProfile
+
+
+def measure(run, setup=None, repeat=3):
+    """
+    The function `measure` times `run` and records its peak memory. The time is the best of `repeat`
+    runs under `time.perf_counter`; the peak memory is measured by `tracemalloc` in one further run,
+    kept separate because tracing slows allocations down. `setup` is called before every run and is
+    not measured.
+
+    :param run: Callable taking the value returned by `setup` (or None).
+    :param setup: Optional callable preparing the input of each run, e.g. copying a DataFrame.
+    :param repeat: Number of timed runs.
+    :return: Dictionary with the best and mean time in seconds and the peak memory allocated during
+    the run in bytes.
+    """
+    timings = []
+    for _ in range(repeat):
+        state = setup() if setup is not None else None
+        gc.collect()
+        start = time.perf_counter()
+        run(state)
+        timings.append(time.perf_counter() - start)
+        del state
+
+    state = setup() if setup is not None else None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run(state)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': min(timings), 'mean_seconds': sum(timings) / len(timings), 'peak_bytes': peak_bytes}
+
+
+# Dependencies that must not be loaded by importing the modules in `IMPORT_CASES`.
+HEAVY_MODULES = ('matplotlib', 'seaborn', 'scipy', 'sqlalchemy', 'psycopg2')
+IMPORT_CASES = ('transformation', 'db_utils', 'pipeline')
+
+_IMPORT_SCRIPT = """
+import json, sys, time, tracemalloc
+if sys.argv[2] == 'trace':
+    tracemalloc.start()
+start = time.perf_counter()
+__import__(sys.argv[1])
+seconds = time.perf_counter() - start
+peak_bytes = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+heavy = sorted({name.split('.')[0] for name in sys.modules} & set(sys.argv[3].split(',')))
+print(json.dumps({'seconds': seconds, 'peak_bytes': peak_bytes, 'heavy_modules': heavy}))
+"""
+
+
+def measure_import(module, repeat=3):
+    """
+    The function `measure_import` measures the cold import of `module` in fresh interpreters, as a
+    short-lived worker process would pay it: the best time of `repeat` imports, the peak memory of one
+    further import under `tracemalloc`, and which of the `HEAVY_MODULES` the import loaded.
+
+    :param module: Name of the module to import.
+    :param repeat: Number of timed imports.
+    :return: Dictionary as returned by `measure`, with the list of 'heavy_modules' loaded.
+    """
+    def run(trace):
+        output = subprocess.run(
+            [sys.executable, '-c', _IMPORT_SCRIPT, module, 'trace' if trace else 'time', ','.join(HEAVY_MODULES)],
+            check=True, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return json.loads(output.stdout)
+
+    timings = [run(False) for _ in range(repeat)]
+    traced = run(True)
+    seconds = [timing['seconds'] for timing in timings]
+    return {
+        'seconds': min(seconds),
+        'mean_seconds': sum(seconds) / len(seconds),
+        'peak_bytes': traced['peak_bytes'],
+        'heavy_modules': traced['heavy_modules'],
+    }
+
+
+class BenchmarkSuite:
+    def __init__(self, n_rows=100000, seed=0, work_dir=None, connection_string=None):
+        """
+        Benchmarks of the data loading and transformation steps on synthetic `loan_payments` data from
+        `synthetic_data.generate_loan_payments`: `RDSDatabaseConnector` reads and file round trips, and
+        every data-processing method of `DataTransform`, `DataFrameInfo` and `DataFrameTransform` (the
+        plotting methods are left out), and the cold import of the modules in `IMPORT_CASES`. Every
+        case runs on a fresh copy of its input.
+
+        :param n_rows: Number of synthetic rows.
+        :param seed: Seed of the generator.
+        :param work_dir: Directory for the database and files written by the benchmarks, defaults to a
+        temporary directory.
+        :param connection_string: Optional SQLAlchemy URL of a local Postgres database to fetch from;
+        the synthetic table is written to it with `write_dataframe_to_table`, and the COPY-based reads
+        and writes are benchmarked against `fetch_data` and `DataFrame.to_sql`. By default a SQLite
+        file in `work_dir` stands in for the RDS database.
+        """
+        self.n_rows = n_rows
+        self.seed = seed
+        self.work_dir = work_dir
+        self.connection_string = connection_string
+        self._fixtures = {}
+
+    def fixture(self, name):
+        """
+        Return one of the input DataFrames, building it on first use: 'raw' (as fetched from the
+        database), 'currency' (raw, with currency strings in the money columns), 'converted' (raw after
+        `apply_schema`) or 'clean' (converted, with missing values imputed).
+        """
+        if name not in self._fixtures:
+            if name == 'raw':
+                data_frame = generate_loan_payments(self.n_rows, seed=self.seed)
+            elif name == 'currency':
+                data_frame = generate_loan_payments(self.n_rows, seed=self.seed, currency_strings=True)
+            elif name == 'converted':
+                data_frame = DataTransform(self.fixture('raw').copy()).apply_schema(LOAN_PAYMENTS_SCHEMA)
+            elif name == 'clean':
+                transformer = DataFrameTransform(self.fixture('converted').copy())
+                transformer.impute_missing_values()
+                data_frame = transformer.data_frame
+            else:
+                raise ValueError(f"Unknown fixture: {name}")
+            self._fixtures[name] = data_frame
+        return self._fixtures[name]
+
+    def connector(self, attach=True):
+        """
+        Return an `RDSDatabaseConnector`, attached to the stand-in database holding the 'raw' table
+        unless `attach` is False.
+        """
+        connector = RDSDatabaseConnector({'username': None, 'password': None, 'host': None, 'port': None,
+                                          'database': None})
+        if not attach:
+            return connector
+        if self.connection_string is None:
+            path = os.path.join(self.work_dir, 'loan_payments.db')
+            if not os.path.exists(path):
+                write_loan_payments_sqlite(path, self.n_rows, seed=self.seed)
+            connector.initialise_engine(connection_string=f'sqlite:///{path}')
+        else:
+            connector.initialise_engine(connection_string=self.connection_string)
+            connector.write_dataframe_to_table(self.fixture('raw'), 'loan_payments', if_exists='replace')
+        return connector
+
+    def cases(self):
+        """
+        Return the benchmark cases as a dictionary mapping each name to `(fixture, setup, run)`: `setup`
+        builds the run's input from a copy of the fixture (or from None when there is no fixture) and
+        `run` is the measured call.
+        """
+        csv_path = os.path.join(self.work_dir, 'loan_payments.csv')
+        parquet_path = os.path.join(self.work_dir, 'loan_payments.parquet')
+
+        def fitted(data_frame):
+            transformer = DataFrameTransform(data_frame)
+            transformer.fit_skew_transformations(max_workers=1)
+            return transformer
+
+        def separate_profile(info):
+            # The scans that `DataFrameInfo.profile` replaces, for comparison.
+            info.describe_columns()
+            info.get_statistics()
+            info.count_null_values()
+            info.data_frame.nunique()
+
+        def offline(data_frame):
+            return self.connector(attach=False)
+
+        def saved(data_frame):
+            self.connector(attach=False).save_data_to_csv(data_frame, csv_path)
+            self.connector(attach=False).save_data_to_parquet(data_frame, parquet_path)
+            return self.connector(attach=False)
+
+        cases = {
+            'DataTransform.convert_to_datetime': ('raw', DataTransform, lambda t: t.convert_to_datetime('issue_date', format='%b-%Y')),
+            'DataTransform.convert_to_numeric': ('raw', DataTransform, lambda t: t.convert_to_numeric('int_rate')),
+            'DataTransform.convert_to_categorical': ('raw', DataTransform, lambda t: t.convert_to_categorical('loan_status')),
+            'DataTransform.remove_symbols[term]': ('raw', DataTransform, lambda t: t.remove_symbols('term', [' months'])),
+            'DataTransform.remove_symbols[currency]': ('currency', DataTransform, lambda t: t.remove_symbols('annual_inc', ['$', ','])),
+            'DataTransform.apply_schema': ('raw', DataTransform, lambda t: t.apply_schema(LOAN_PAYMENTS_SCHEMA)),
+
+            'DataFrameInfo.describe_columns': ('converted', DataFrameInfo, lambda i: i.describe_columns()),
+            'DataFrameInfo.get_statistics': ('converted', DataFrameInfo, lambda i: i.get_statistics()),
+            'DataFrameInfo.count_distinct_values': ('converted', DataFrameInfo, lambda i: i.count_distinct_values()),
+            'DataFrameInfo.get_shape': ('converted', DataFrameInfo, lambda i: i.get_shape()),
+            'DataFrameInfo.count_null_values': ('converted', DataFrameInfo, lambda i: i.count_null_values()),
+            'DataFrameInfo.value_counts': ('converted', DataFrameInfo, lambda i: i.value_counts('loan_status')),
+            'DataFrameInfo.profile': ('converted', DataFrameInfo, lambda i: i.profile()),
+            'DataFrameInfo.profile[separate calls]': ('converted', DataFrameInfo, separate_profile),
+
+            'NullProfile.capture': ('converted', lambda data_frame: data_frame, NullProfile.capture),
+            'DataFrameTransform.check_null_values': ('converted', DataFrameTransform, lambda t: t.check_null_values()),
+            'DataFrameTransform.drop_columns': ('converted', DataFrameTransform, lambda t: t.drop_columns(['payment_plan', 'policy_code'])),
+            'DataFrameTransform.impute_missing_values': ('converted', DataFrameTransform, lambda t: t.impute_missing_values()),
+            'DataFrameTransform.check_null_values_after': ('clean', DataFrameTransform, lambda t: t.check_null_values_after()),
+            'DataFrameTransform.identify_skewed_columns': ('clean', DataFrameTransform, lambda t: t.identify_skewed_columns()),
+            'DataFrameTransform.apply_transformation': ('clean', DataFrameTransform, lambda t: t.apply_transformation('loan_amount', 'boxcox')),
+            'DataFrameTransform.find_best_transformation': ('clean', DataFrameTransform, lambda t: t.find_best_transformation('loan_amount')),
+            'DataFrameTransform.transform_skewed_columns': ('clean', DataFrameTransform, lambda t: t.transform_skewed_columns()),
+            'DataFrameTransform.fit_skew_transformations': ('clean', DataFrameTransform, lambda t: t.fit_skew_transformations()),
+            'DataFrameTransform.apply_skew_transformations': ('clean', fitted, lambda t: t.apply_skew_transformations()),
+            'DataFrameTransform.correct_skewness': ('clean', DataFrameTransform, lambda t: t.correct_skewness()),
+            'DataFrameTransform.compute_outlier_bounds': ('clean', DataFrameTransform, lambda t: t.compute_outlier_bounds()),
+            'DataFrameTransform.remove_outliers[sequential]': ('clean', DataFrameTransform, lambda t: t.remove_outliers()),
+            'DataFrameTransform.remove_outliers[drop]': ('clean', DataFrameTransform, lambda t: t.remove_outliers(mode='drop')),
+            'DataFrameTransform.remove_outliers[flag]': ('clean', DataFrameTransform, lambda t: t.remove_outliers(mode='flag')),
+            'DataFrameTransform.compute_correlation_matrix': ('clean', DataFrameTransform, lambda t: t.compute_correlation_matrix()),
+            'DataFrameTransform.find_correlated_columns': ('clean', DataFrameTransform, lambda t: t.find_correlated_columns()),
+            'DataFrameTransform.remove_highly_correlated_columns': ('clean', DataFrameTransform, lambda t: t.remove_highly_correlated_columns()),
+            'DataFrameTransform.save_dataframe[csv]': ('clean', DataFrameTransform, lambda t: t.save_dataframe(csv_path)),
+            'DataFrameTransform.save_dataframe[parquet]': ('clean', DataFrameTransform, lambda t: t.save_dataframe(parquet_path)),
+
+            'RDSDatabaseConnector.save_data_to_csv': (None, offline, lambda c: c.save_data_to_csv(self.fixture('raw'), csv_path)),
+            'RDSDatabaseConnector.load_data_from_csv': ('raw', saved, lambda c: c.load_data_from_csv(csv_path)),
+            'RDSDatabaseConnector.save_data_to_parquet': (None, offline, lambda c: c.save_data_to_parquet(self.fixture('raw'), parquet_path)),
+            'RDSDatabaseConnector.load_data_from_parquet': ('raw', saved, lambda c: c.load_data_from_parquet(parquet_path)),
+        }
+
+        connectors = []
+
+        def attached(data_frame):
+            # The stand-in database is written once, by the first fetch case that runs.
+            if not connectors:
+                connectors.append(self.connector())
+            return connectors[0]
+
+        cases['RDSDatabaseConnector.fetch_data'] = (None, attached, lambda c: c.fetch_loan_payments())
+        cases['RDSDatabaseConnector.fetch_data_in_chunks'] = (
+            None, attached, lambda c: sum(len(chunk) for chunk in c.fetch_loan_payments_in_chunks()))
+        cases['RDSDatabaseConnector.fetch_data_partitioned'] = (
+            None, attached, lambda c: c.fetch_data_partitioned('loan_payments', 'id'))
+        if self.connection_string is None:
+            return cases
+
+        # The COPY paths are PostgreSQL-only; each is timed next to the pandas call it replaces
+        # (`fetch_data` for the reads, `DataFrame.to_sql` for the writes).
+        copy_path = os.path.join(self.work_dir, 'loan_payments_copy.csv')
+
+        def exported(data_frame):
+            connector = attached(data_frame)
+            connector.copy_to_file('loan_payments', copy_path)
+            return connector
+
+        def emptied(data_frame):
+            from sqlalchemy import text
+
+            connector = exported(data_frame)
+            with connector.engine.begin() as connection:
+                connection.execute(text("DROP TABLE IF EXISTS loan_payments_copy"))
+                connection.execute(text("CREATE TABLE loan_payments_copy AS SELECT * FROM loan_payments WITH NO DATA"))
+            return connector
+
+        cases['RDSDatabaseConnector.copy_to_file'] = (None, attached, lambda c: c.copy_to_file('loan_payments', copy_path))
+        cases['RDSDatabaseConnector.fetch_data_via_copy'] = (None, attached, lambda c: c.fetch_data_via_copy('loan_payments'))
+        cases['RDSDatabaseConnector.copy_from_file'] = (None, emptied, lambda c: c.copy_from_file(copy_path, 'loan_payments_copy'))
+        cases['RDSDatabaseConnector.write_dataframe_to_table'] = (
+            None, attached, lambda c: c.write_dataframe_to_table(self.fixture('raw'), 'loan_payments_copy', if_exists='replace'))
+        cases['DataFrame.to_sql'] = (
+            None, attached, lambda c: self.fixture('raw').to_sql('loan_payments_copy', c.engine, if_exists='replace',
+                                                                 index=False, chunksize=100000))
+        return cases
+
+    @contextlib.contextmanager
+    def _work_dir(self):
+        # Use a temporary directory for the duration of the block unless `work_dir` was given.
+        with tempfile.TemporaryDirectory() as temporary_dir:
+            if self.work_dir is None:
+                self.work_dir = temporary_dir
+            os.makedirs(self.work_dir, exist_ok=True)
+            try:
+                yield self.work_dir
+            finally:
+                if self.work_dir == temporary_dir:
+                    self.work_dir = None
+
+    def check_partitioned(self, partitions=4):
+        """
+        Check that `fetch_data_partitioned` returns the same rows, in the same key order, as the serial
+        `fetch_data`: on `id` and, against Postgres, on the text `issue_date` parsed as 'Mon-YYYY' dates
+        (SQLite has no `to_date`).
+
+        :param partitions: Number of partitions to read.
+        :return: Dictionary mapping each key column to whether the results match.
+        """
+        keys = [('id', None)]
+        if self.connection_string is not None:
+            keys.append(('issue_date', 'Mon-YYYY'))
+        matches = {}
+        with self._work_dir():
+            connector = self.connector()
+            for key_column, key_format in keys:
+                order = f"to_date({key_column}, '{key_format}')" if key_format else key_column
+                serial = connector.fetch_data(f"SELECT * FROM loan_payments ORDER BY {order}")
+                partitioned = connector.fetch_data_partitioned('loan_payments', key_column, partitions,
+                                                               key_format=key_format)
+                # Rows sharing a key come back in no particular order, so once the keys are known to be
+                # in the same order the rows are compared in primary key order.
+                same_order = serial[key_column].equals(partitioned[key_column])
+                same_rows = serial.sort_values('id', ignore_index=True).equals(
+                    partitioned.sort_values('id', ignore_index=True))
+                matches[key_column] = same_order and same_rows
+                print(f"fetch_data_partitioned on {key_column:<12} {'matches' if matches[key_column] else 'DIFFERS FROM'}"
+                      f" the serial fetch ({len(partitioned)} rows, {len(connector.partition_timings)} partitions)")
+        return matches
+
+    def run(self, only=None, repeat=3):
+        """
+        Run the benchmarks.
+
+        :param only: Optional substring; only the cases whose name contains it are run.
+        :param repeat: Number of timed runs per case.
+        :return: Dictionary with the run's environment and a 'results' dictionary mapping each case
+        name to its measurement, as returned by `measure`.
+        """
+        with self._work_dir():
+            results = {}
+            for module in IMPORT_CASES:
+                name = f'import {module}'
+                if only is not None and only not in name:
+                    continue
+                results[name] = measure_import(module, repeat=repeat)
+                print(f"{name:<55} {results[name]['seconds']:>9.4f}s {results[name]['peak_bytes'] / 2 ** 20:>10.1f} MiB"
+                      f"  {' '.join(results[name]['heavy_modules'])}")
+
+            for name, (fixture, setup, run) in self.cases().items():
+                if only is not None and only not in name:
+                    continue
+                data_frame = self.fixture(fixture) if fixture is not None else None
+                results[name] = measure(
+                    run, lambda: setup(data_frame.copy() if data_frame is not None else None), repeat=repeat)
+                print(f"{name:<55} {results[name]['seconds']:>9.4f}s {results[name]['peak_bytes'] / 2 ** 20:>10.1f} MiB")
+
+        return {
+            'n_rows': self.n_rows,
+            'seed': self.seed,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'results': results,
+        }
+
+
+def save_results(results, path):
+    """
+    Save the output of `BenchmarkSuite.run` to a JSON file, e.g. as the baseline of later runs.
+    """
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2)
+
+
+def load_results(path):
+    """
+    Load results saved with `save_results`.
+    """
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+def compare(results, baseline, tolerance=0.25, min_seconds=0.01):
+    """
+    The function `compare` compares benchmark results with a baseline run, case by case.
+
+    :param results: Output of `BenchmarkSuite.run`.
+    :param baseline: Baseline output of `BenchmarkSuite.run`, e.g. from `load_results`.
+    :param tolerance: Relative slowdown or memory growth above which a case counts as a regression.
+    :param min_seconds: Time below which slowdowns are ignored as timer noise.
+    :return: DataFrame indexed by the cases run in both, with the times, peak memory, their ratios to
+    the baseline and a boolean 'regression' column.
+    """
+    if results['n_rows'] != baseline['n_rows']:
+        print(f"Warning: comparing {results['n_rows']} rows with a baseline of {baseline['n_rows']} rows.")
+    names = [name for name in results['results'] if name in baseline['results']]
+    comparison = pd.DataFrame({
+        'seconds': [results['results'][name]['seconds'] for name in names],
+        'baseline_seconds': [baseline['results'][name]['seconds'] for name in names],
+        'peak_bytes': [results['results'][name]['peak_bytes'] for name in names],
+        'baseline_peak_bytes': [baseline['results'][name]['peak_bytes'] for name in names],
+    }, index=pd.Index(names, name='case'))
+    comparison['time_ratio'] = comparison['seconds'] / comparison['baseline_seconds']
+    comparison['memory_ratio'] = comparison['peak_bytes'] / comparison['baseline_peak_bytes'].replace(0, np.nan)
+    slower = (comparison['time_ratio'] > 1 + tolerance) & (comparison['seconds'] >= min_seconds)
+    comparison['regression'] = slower | (comparison['memory_ratio'] > 1 + tolerance)
+    return comparison
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the loan_payments pipeline on synthetic data.')
+    parser.add_argument('--rows', type=int, default=100000, help='number of synthetic rows')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per case')
+    parser.add_argument('--only', help='only run the cases whose name contains this string')
+    parser.add_argument('--work-dir', help='directory for the files written by the benchmarks')
+    parser.add_argument('--connection-string', help='SQLAlchemy URL of a local Postgres database to fetch from')
+    parser.add_argument('--output', help='save the results to this JSON file')
+    parser.add_argument('--baseline', help='compare the results with this JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='relative slowdown counted as a regression')
+    args = parser.parse_args()
+
+    suite = BenchmarkSuite(args.rows, seed=args.seed, work_dir=args.work_dir, connection_string=args.connection_string)
+    results = suite.run(only=args.only, repeat=args.repeat)
+    partitioned_matches = suite.check_partitioned() if args.only is None or args.only in 'fetch_data_partitioned' else {}
+    if args.output:
+        save_results(results, args.output)
+    heavy_imports = {name: result['heavy_modules'] for name, result in results['results'].items()
+                     if result.get('heavy_modules')}
+    if heavy_imports:
+        print(f"Heavy dependencies loaded at import time: {heavy_imports}")
+    if args.baseline:
+        comparison = compare(results, load_results(args.baseline), tolerance=args.tolerance)
+        with pd.option_context('display.width', 200, 'display.max_rows', None, 'display.max_columns', None):
+            print(comparison)
+        if comparison['regression'].any():
+            sys.exit(1)
+    if heavy_imports or not all(partitioned_matches.values()):
+        sys.exit(1)
@@ -0,0 +1,338 @@
+import contextlib
+import cProfile
+import functools
+import inspect
+import json
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+# State of the instrumentation while it is enabled; `sink` is None while it is disabled.
+_STATE = {'sink': None, 'track_memory': False, 'profile_step': None, 'profile_dir': None}
+# Attributes replaced by `enable`, as (owner, name, original attribute), for `disable` to restore.
+_PATCHED = []
+_LOCK = threading.Lock()
+_LOCAL = threading.local()
+
+
+class JsonLinesSink:
+    def __init__(self, path):
+        """
+        An event sink appending each event to a file as one line of JSON.
+
+        :param path: Path of the file; it is created if needed and appended to otherwise.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a')
+
+    def __call__(self, event):
+        line = json.dumps(event, default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def _rows(value):
+    return len(value) if isinstance(value, (pd.DataFrame, pd.Series)) else None
+
+
+def _rows_in(args, kwargs):
+    """
+    The number of rows going into a call: those of the instance's `data_frame`, or else of the first
+    DataFrame argument (e.g. `save_data_to_csv(data_frame, file_path)`).
+    """
+    if args and isinstance(getattr(args[0], 'data_frame', None), pd.DataFrame):
+        return len(args[0].data_frame)
+    for value in list(args) + list(kwargs.values()):
+        if isinstance(value, pd.DataFrame):
+            return len(value)
+    return None
+
+
+def _rows_out(args, result):
+    """
+    The number of rows coming out of a call: those of the instance's `data_frame` after the call, as
+    most methods modify it in place and return summaries, or else of its DataFrame or Series result.
+    """
+    if args and isinstance(getattr(args[0], 'data_frame', None), pd.DataFrame):
+        return len(args[0].data_frame)
+    return _rows(result)
+
+
+class _Span:
+    """
+    The measurement of one instrumented call. Spans of nested calls form a per-thread stack, so each
+    event records its depth and parent, and the peak memory seen by a nested call is carried up to
+    the calls around it (`tracemalloc` keeps a single peak, which each span resets).
+    """
+
+    def __init__(self, name, rows_in):
+        self.name = name
+        self.rows_in = rows_in
+        self.seconds = 0.0
+        self.peak_bytes = None
+        self.child_peak = 0
+        self.base_bytes = 0
+        stack = getattr(_LOCAL, 'stack', None)
+        if stack is None:
+            stack = _LOCAL.stack = []
+        self.stack = stack
+        self.parent = stack[-1].name if stack else None
+        self.depth = len(stack)
+        self.started = time.time()
+        # Only the outermost call of the chosen step is profiled, as profilers cannot be nested.
+        self.profiler = None
+        if name == _STATE['profile_step'] and not any(span.profiler for span in stack):
+            self.profiler = cProfile.Profile()
+
+    def enter(self):
+        if _STATE['track_memory'] and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if self.stack:
+                self.stack[-1].child_peak = max(self.stack[-1].child_peak, peak)
+            tracemalloc.reset_peak()
+            self.base_bytes = current
+        if self.profiler is not None:
+            try:
+                self.profiler.enable()
+            except ValueError:
+                # Another profiler is already active, e.g. one started by the user.
+                self.profiler = None
+        self.stack.append(self)
+        self._start = time.perf_counter()
+
+    def exit(self):
+        self.seconds += time.perf_counter() - self._start
+        self.stack.pop()
+        if self.profiler is not None:
+            self.profiler.disable()
+        if _STATE['track_memory'] and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self.child_peak)
+            self.peak_bytes = max(self.peak_bytes or 0, peak - self.base_bytes)
+            if self.stack:
+                self.stack[-1].child_peak = max(self.stack[-1].child_peak, peak)
+
+    def emit(self, rows_out, error=None, chunks=None):
+        event = {
+            'event': 'call',
+            'name': self.name,
+            'started': self.started,
+            'seconds': self.seconds,
+            'rows_in': self.rows_in,
+            'rows_out': rows_out,
+            'peak_bytes': self.peak_bytes,
+            'depth': self.depth,
+            'parent': self.parent,
+            'thread': threading.current_thread().name,
+            'error': error,
+        }
+        if chunks is not None:
+            event['chunks'] = chunks
+        if self.profiler is not None:
+            file_name = f"{re.sub(r'[^A-Za-z0-9_.-]', '_', self.name)}-{os.getpid()}-{time.time_ns()}.prof"
+            event['profile'] = os.path.join(_STATE['profile_dir'], file_name)
+            self.profiler.dump_stats(event['profile'])
+        sink = _STATE['sink']
+        if sink is not None:
+            sink(event)
+
+
+def instrument(func, name=None):
+    """
+    The function `instrument` wraps `func` so that, while the instrumentation is enabled, every call
+    emits an event with its duration, the rows going in and out, and optionally its peak memory.
+    While it is disabled the wrapper only checks a flag; `enable` avoids even that for the pipeline's
+    classes by installing the wrappers only while it is on.
+
+    Generator functions are wrapped by a generator: the time spent producing the items (not the time
+    the consumer spends on them) and the number of rows yielded are reported in one event when the
+    generator is exhausted or closed.
+
+    :param func: Function or method to wrap.
+    :param name: Name used in the events, defaults to the function's qualified name.
+    :return: The wrapper.
+    """
+    name = name or func.__qualname__
+
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            if _STATE['sink'] is None:
+                yield from func(*args, **kwargs)
+                return
+            span = _Span(name, _rows_in(args, kwargs))
+            span.enter()
+            try:
+                generator = func(*args, **kwargs)
+            finally:
+                span.exit()
+            rows_out, chunks, error = 0, 0, None
+            try:
+                while True:
+                    span.enter()
+                    try:
+                        item = next(generator)
+                    except StopIteration:
+                        break
+                    except BaseException as exception:
+                        error = repr(exception)
+                        raise
+                    finally:
+                        span.exit()
+                    chunks += 1
+                    rows_out += _rows(item) or 0
+                    yield item
+            finally:
+                generator.close()
+                span.emit(rows_out, error=error, chunks=chunks)
+        return generator_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _STATE['sink'] is None:
+            return func(*args, **kwargs)
+        span = _Span(name, _rows_in(args, kwargs))
+        span.enter()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as exception:
+            span.exit()
+            span.emit(None, error=repr(exception))
+            raise
+        span.exit()
+        span.emit(_rows_out(args, result))
+        return result
+    return wrapper
+
+
+def _public_attributes(owner):
+    for name, attribute in vars(owner).items():
+        if not name.startswith('_'):
+            yield name, attribute
+
+
+def instrument_class(cls):
+    """
+    Replace every public method of `cls` (including static and class methods) by an instrumented
+    wrapper, until `disable` is called.
+
+    :param cls: Class to instrument.
+    """
+    for name, attribute in _public_attributes(cls):
+        if isinstance(attribute, (staticmethod, classmethod)):
+            wrapped = type(attribute)(instrument(attribute.__func__, f"{cls.__name__}.{name}"))
+        elif inspect.isfunction(attribute):
+            wrapped = instrument(attribute, f"{cls.__name__}.{name}")
+        else:
+            continue
+        _PATCHED.append((cls, name, attribute))
+        setattr(cls, name, wrapped)
+
+
+def instrument_module(module):
+    """
+    Instrument the public functions and the public methods of the classes defined in `module`,
+    until `disable` is called. Functions are replaced in the module's namespace, so calls made through
+    the module (and from within it) are recorded, but names imported elsewhere beforehand are not.
+
+    :param module: Module to instrument, e.g. `db_utils`.
+    """
+    for name, attribute in _public_attributes(module):
+        if getattr(attribute, '__module__', None) != module.__name__:
+            continue
+        if inspect.isclass(attribute):
+            instrument_class(attribute)
+        elif inspect.isfunction(attribute):
+            _PATCHED.append((module, name, attribute))
+            setattr(module, name, instrument(attribute, f"{module.__name__}.{name}"))
+
+
+def enable(sink, track_memory=False, profile_step=None, profile_dir='.', modules=None):
+    """
+    The function `enable` turns the instrumentation on: every public method of `db_utils` and
+    `transformation` emits an event per call to `sink` until `disable` is called.
+
+    :param sink: Callable receiving each event as a dictionary, e.g. `events.append`, or a
+    `JsonLinesSink`.
+    :param track_memory: Whether to record the peak memory allocated during each call, with
+    `tracemalloc`. Tracing slows down allocation-heavy code noticeably, so it is off by default.
+    :param profile_step: Optional event name, e.g. 'DataFrameTransform.fit_skew_transformations', whose
+    calls are profiled with `cProfile`; each profile is saved as a `.prof` file (readable with `pstats`
+    or snakeviz) and its path is added to the event.
+    :param profile_dir: Directory in which profiles are saved.
+    :param modules: Modules to instrument, defaults to `db_utils`, `transformation`, and `plotting` if
+    it has already been imported (it is not imported here, as that would load matplotlib).
+    """
+    if modules is None:
+        import db_utils
+        import transformation
+        modules = [db_utils, transformation]
+        if 'plotting' in sys.modules:
+            modules.append(sys.modules['plotting'])
+
+    with _LOCK:
+        if _STATE['sink'] is not None:
+            raise ValueError("Instrumentation already enabled. Call 'disable' first.")
+        for module in modules:
+            instrument_module(module)
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _STATE['stop_tracing'] = True
+        if profile_step is not None:
+            os.makedirs(profile_dir, exist_ok=True)
+        _STATE.update(sink=sink, track_memory=track_memory, profile_step=profile_step, profile_dir=profile_dir)
+
+
+def disable():
+    """
+    Turn the instrumentation off and restore the original methods.
+    """
+    with _LOCK:
+        while _PATCHED:
+            owner, name, attribute = _PATCHED.pop()
+            setattr(owner, name, attribute)
+        if _STATE.pop('stop_tracing', False):
+            tracemalloc.stop()
+        _STATE.update(sink=None, track_memory=False, profile_step=None, profile_dir=None)
+
+
+@contextlib.contextmanager
+def instrumented(sink=None, **kwargs):
+    """
+    Context manager enabling the instrumentation for the duration of a block.
+
+    :param sink: Event sink as for `enable`, defaults to collecting the events in the list returned by
+    the context manager.
+    :param kwargs: Other arguments of `enable`.
+    """
+    events = []
+    enable(sink if sink is not None else events.append, **kwargs)
+    try:
+        yield events
+    finally:
+        disable()
+
+
+def summarise_events(events):
+    """
+    Aggregate events by name: number of calls, total and maximum time, rows in and out, and the largest
+    peak memory, sorted by total time.
+
+    :param events: List of events, e.g. from `instrumented` or read back from a JSON lines file.
+    :return: DataFrame indexed by event name.
+    """
+    frame = pd.DataFrame(events, columns=['name', 'seconds', 'rows_in', 'rows_out', 'peak_bytes', 'depth'])
+    summary = frame.groupby('name').agg(
+        calls=('seconds', 'size'), total_seconds=('seconds', 'sum'), max_seconds=('seconds', 'max'),
+        rows_in=('rows_in', 'sum'), rows_out=('rows_out', 'sum'), peak_bytes=('peak_bytes', 'max'))
+    return summary.sort_values('total_seconds', ascending=False)
@@ -0,0 +1,262 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from transformation import DataFrameTransform, _apply_fitted_transformation, _outlier_matrix
+
+
+class ImputeStep:
+    name = 'impute'
+
+    def __init__(self, strategy='median'):
+        """
+        Fills missing numeric values with the median or mean learned at fit time, as
+        `DataFrameTransform.impute_missing_values` does.
+
+        :param strategy: Imputation strategy ('median' or 'mean').
+        """
+        if strategy not in ('median', 'mean'):
+            raise ValueError("Unsupported imputation strategy. Use 'median' or 'mean'.")
+        self.strategy = strategy
+        self.values = None
+
+    def fit(self, data_frame):
+        numeric = data_frame.select_dtypes(include=['number'])
+        values = numeric.median() if self.strategy == 'median' else numeric.mean()
+        self.values = {column: float(value) for column, value in values.items()}
+        return self
+
+    def transform(self, data_frame):
+        return data_frame.fillna({column: value for column, value in self.values.items() if column in data_frame})
+
+    def get_params(self):
+        return {'strategy': self.strategy}
+
+    def get_state(self):
+        return {'values': self.values}
+
+    def set_state(self, state):
+        self.values = state['values']
+
+
+class SkewStep:
+    name = 'skew'
+
+    def __init__(self, skew_threshold=0.75, sample_size=100000, max_workers=1):
+        """
+        Applies the skew-correcting transformation chosen and fitted for each skewed column at fit time
+        by `DataFrameTransform.fit_skew_transformations`.
+
+        :param skew_threshold: Skewness above which a column is transformed.
+        :param sample_size: Maximum number of values per column used for fitting.
+        :param max_workers: Number of worker processes used for fitting.
+        """
+        self.skew_threshold = skew_threshold
+        self.sample_size = sample_size
+        self.max_workers = max_workers
+        self.transformations = None
+
+    def fit(self, data_frame):
+        transformer = DataFrameTransform(data_frame)
+        columns = transformer.identify_skewed_columns(self.skew_threshold)
+        self.transformations = transformer.fit_skew_transformations(
+            columns, sample_size=self.sample_size, max_workers=self.max_workers)
+        return self
+
+    def transform(self, data_frame):
+        transformed = {
+            column: _apply_fitted_transformation(data_frame[column].to_numpy(dtype=np.float64, na_value=np.nan), params)
+            for column, params in self.transformations.items() if column in data_frame.columns
+        }
+        return data_frame.assign(**transformed)
+
+    def get_params(self):
+        return {'skew_threshold': self.skew_threshold, 'sample_size': self.sample_size, 'max_workers': self.max_workers}
+
+    def get_state(self):
+        return {'transformations': self.transformations}
+
+    def set_state(self, state):
+        self.transformations = state['transformations']
+
+
+class OutlierStep:
+    name = 'outliers'
+
+    def __init__(self, method='iqr', threshold=1.5, action='drop'):
+        """
+        Removes (or flags) rows outside the outlier bounds learned at fit time by
+        `DataFrameTransform.compute_outlier_bounds`.
+
+        :param method: 'iqr' or 'z-score'.
+        :param threshold: Multiplier of the IQR or of the standard deviation.
+        :param action: 'drop' to remove outlying rows, or 'flag' to add a boolean `is_outlier` column.
+        """
+        if method not in ('iqr', 'z-score'):
+            raise ValueError("Unsupported method. Use 'iqr' or 'z-score'.")
+        if action not in ('drop', 'flag'):
+            raise ValueError("Unsupported action. Use 'drop' or 'flag'.")
+        self.method = method
+        self.threshold = threshold
+        self.action = action
+        self.bounds = None
+
+    def fit(self, data_frame):
+        bounds = DataFrameTransform(data_frame).compute_outlier_bounds(method=self.method, threshold=self.threshold)
+        self.bounds = {column: [float(row['lower']), float(row['upper'])] for column, row in bounds.iterrows()}
+        return self
+
+    def transform(self, data_frame):
+        bounds = pd.DataFrame.from_dict(
+            {column: bound for column, bound in self.bounds.items() if column in data_frame.columns},
+            orient='index', columns=['lower', 'upper'])
+        outliers = _outlier_matrix(data_frame, bounds, self.method).any(axis=1)
+        if self.action == 'flag':
+            return data_frame.assign(is_outlier=outliers)
+        return data_frame[~outliers]
+
+    def get_params(self):
+        return {'method': self.method, 'threshold': self.threshold, 'action': self.action}
+
+    def get_state(self):
+        return {'bounds': self.bounds}
+
+    def set_state(self, state):
+        self.bounds = state['bounds']
+
+
+class CorrelationStep:
+    name = 'correlation'
+
+    def __init__(self, threshold=0.8):
+        """
+        Drops the columns selected at fit time by `DataFrameTransform.find_correlated_columns`.
+
+        :param threshold: Maximum absolute correlation allowed between the remaining columns.
+        """
+        self.threshold = threshold
+        self.dropped_columns = None
+
+    def fit(self, data_frame):
+        # The matrix is only needed once, so it is not cached.
+        self.dropped_columns = DataFrameTransform(data_frame).find_correlated_columns(self.threshold, use_cache=False)
+        return self
+
+    def transform(self, data_frame):
+        return data_frame.drop(columns=self.dropped_columns, errors='ignore')
+
+    def get_params(self):
+        return {'threshold': self.threshold}
+
+    def get_state(self):
+        return {'dropped_columns': self.dropped_columns}
+
+    def set_state(self, state):
+        self.dropped_columns = state['dropped_columns']
+
+
+STEPS = {step.name: step for step in (ImputeStep, SkewStep, OutlierStep, CorrelationStep)}
+
+
+class PreprocessingPipeline:
+    def __init__(self, steps=None):
+        """
+        A sequence of `DataFrameTransform` steps with fit/transform semantics: `fit` learns each step's
+        statistics (medians, skew transformations, outlier bounds, dropped columns) once, and
+        `transform` applies them unchanged to new batches or streamed chunks without recomputing them.
+        Unlike `DataFrameTransform`, the input DataFrame is never modified in place.
+
+        :param steps: List of step objects, defaults to imputation, skew correction, outlier removal
+        and correlated-column pruning, in that order.
+        """
+        if steps is None:
+            steps = [ImputeStep(), SkewStep(), OutlierStep(), CorrelationStep()]
+        self.steps = steps
+        self.fitted = False
+
+    def fit(self, data_frame):
+        """
+        Fit every step in turn, each on the output of the previous ones.
+
+        :param data_frame: Training DataFrame.
+        :return: This pipeline.
+        """
+        self.fit_transform(data_frame)
+        return self
+
+    def fit_transform(self, data_frame):
+        """
+        Fit every step in turn and return the transformed training DataFrame.
+        """
+        for step in self.steps:
+            data_frame = step.fit(data_frame).transform(data_frame)
+        self.fitted = True
+        return data_frame
+
+    def transform(self, data_frame):
+        """
+        Apply the fitted steps to a DataFrame.
+
+        :param data_frame: DataFrame with (at least) the columns seen at fit time.
+        :return: The transformed DataFrame.
+        """
+        if not self.fitted:
+            raise ValueError("Pipeline not fitted. Call 'fit' first.")
+        for step in self.steps:
+            data_frame = step.transform(data_frame)
+        return data_frame
+
+    def transform_chunks(self, chunks):
+        """
+        Apply the fitted steps to each DataFrame of a stream, e.g. from
+        `RDSDatabaseConnector.fetch_data_in_chunks`.
+
+        :param chunks: Iterable of DataFrames.
+        :return: A generator of transformed DataFrames.
+        """
+        for chunk in chunks:
+            yield self.transform(chunk)
+
+    def to_dict(self):
+        """
+        Return the pipeline's steps, parameters and fitted state as plain Python values.
+        """
+        return {
+            'fitted': self.fitted,
+            'steps': [{'step': step.name, 'params': step.get_params(), 'state': step.get_state()} for step in self.steps],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild a pipeline from the output of `to_dict`.
+        """
+        steps = []
+        for entry in data['steps']:
+            step = STEPS[entry['step']](**entry['params'])
+            step.set_state(entry['state'])
+            steps.append(step)
+        pipeline = cls(steps)
+        pipeline.fitted = data['fitted']
+        return pipeline
+
+    def save(self, path):
+        """
+        Save the pipeline and its fitted state to a JSON file.
+
+        :param path: Destination path.
+        """
+        with open(path, 'w') as file:
+            json.dump(self.to_dict(), file)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a pipeline saved with `save`.
+
+        :param path: Path of the JSON file.
+        :return: A `PreprocessingPipeline`.
+        """
+        with open(path, 'r') as file:
+            return cls.from_dict(json.load(file))
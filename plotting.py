@@ -0,0 +1,297 @@
+import html
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import matplotlib.pyplot as plt
+import pandas as pd
+import seaborn as sns
+
+from streaming_stats import HistogramAccumulator
+from transformation import NullProfile
+
+
+def _chart_summaries(histograms, bins, max_fliers=1000):
+    """
+    Turns a `HistogramAccumulator` into what the charts of each column need: histogram counts and
+    edges with `bins` bins, box-plot statistics, the skewness, and a Gaussian KDE computed by smoothing
+    the accumulator's finer bins with the bandwidth of Scott's rule. Quartiles come from the quantile
+    sketches and the whiskers are the data extremes clipped to the 1.5 IQR fences. The fliers are the
+    values beyond the fences among the items retained by the quantile sketch (a sample of the column)
+    and the extremes, thinned to at most `max_fliers` evenly spaced values.
+    """
+    resolution = histograms.bins // bins
+    skewness = histograms.moments.skew()
+    std = np.sqrt(histograms.moments.variance())
+    summaries = {}
+    for index, column in enumerate(histograms.columns):
+        n = histograms.moments.count[index]
+        if not n:
+            continue
+        fine_counts, fine_edges = histograms.counts[index], histograms.edges(column)
+        q1, median, q3 = histograms.sketches[column].quantile([0.25, 0.5, 0.75])
+        minimum, maximum = histograms.moments.minimum[index], histograms.moments.maximum[index]
+        lower_fence, upper_fence = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+        retained = np.unique(np.concatenate(histograms.sketches[column].compactors + [[minimum, maximum]]))
+        fliers = retained[(retained < lower_fence) | (retained > upper_fence)]
+        if len(fliers) > max_fliers:
+            fliers = fliers[np.linspace(0, len(fliers) - 1, max_fliers).round().astype(np.int64)]
+        box = {
+            'med': median, 'q1': q1, 'q3': q3,
+            'whislo': max(minimum, lower_fence), 'whishi': min(maximum, upper_fence),
+            'fliers': fliers,
+        }
+
+        centres = (fine_edges[:-1] + fine_edges[1:]) / 2
+        density = np.full(len(centres), np.nan)
+        bandwidth = std.iloc[index] * n ** -0.2
+        if n > 1 and bandwidth > 0:
+            sigma = bandwidth / (fine_edges[1] - fine_edges[0])
+            radius = min(int(np.ceil(4 * sigma)), (len(fine_counts) - 1) // 2)
+            offsets = np.arange(-radius, radius + 1)
+            kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+            # Scaled to counts per display bin, so the curve overlays the histogram.
+            density = np.convolve(fine_counts, kernel / kernel.sum(), mode='same') * resolution
+
+        summaries[column] = {
+            'counts': fine_counts.reshape(bins, resolution).sum(axis=1),
+            'edges': fine_edges[::resolution],
+            'box': box,
+            'skew': float(skewness.iloc[index]),
+            'kde_x': centres,
+            'kde_y': density,
+        }
+    return summaries
+
+
+def _draw_chart(axes, kind, column, summary):
+    """
+    Draws one chart of a column from its pre-computed summary on `axes`.
+    """
+    if kind == 'boxplot':
+        axes.bxp([summary['box']], vert=False, showfliers=True)
+        axes.set_yticks([])
+        axes.set_xlabel(str(column))
+        axes.set_title(f'Boxplot of {column}')
+    elif kind in ('histogram', 'skewness'):
+        axes.stairs(summary['counts'], summary['edges'], fill=True, alpha=0.6)
+        axes.plot(summary['kde_x'], summary['kde_y'])
+        axes.set_xlabel(str(column))
+        axes.set_ylabel('Count')
+        if kind == 'histogram':
+            axes.set_title(f'Histogram of {column}')
+        else:
+            axes.set_title(f"Skewness of {column}: {summary['skew']:.2f}")
+    else:
+        raise ValueError("Unsupported chart. Use 'boxplot', 'histogram' or 'skewness'.")
+
+
+def _render_chart(kind, column, summary, path):
+    """
+    Draws one report chart from a pre-computed column summary and saves it to `path`. The figure is
+    created without pyplot, so no GUI backend is involved and it can run in any worker process.
+    """
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=(8, 6))
+    _draw_chart(figure.subplots(), kind, column, summary)
+    figure.tight_layout()
+    figure.savefig(path)
+    return path
+
+
+class Plotter:
+    def __init__(self, data_frame):
+        self.data_frame = data_frame
+        
+    def plot_null_values(self, before=None, after=None):
+        """
+        Plot the count of NULL values in each column before and after removal or imputation.
+        
+        :param before: `NullProfile` captured before the change, e.g. `DataFrameTransform.null_profile_before`;
+        defaults to a snapshot of this Plotter's DataFrame.
+        :param after: `NullProfile` captured after the change, e.g. `DataFrameTransform.null_profile_after`.
+        When omitted only the `before` counts are plotted.
+        """
+        if before is None:
+            before = NullProfile.capture(self.data_frame)
+        counts = before.compare(after if after is not None else before)
+
+        fig, ax = plt.subplots(figsize=(10, 6))
+        bar_width = 0.35 if after is not None else 0.7
+        indices = np.arange(len(counts))
+        ax.bar(indices, counts['before'], bar_width, label='Before Removal')
+        if after is not None:
+            ax.bar(indices + bar_width, counts['after'], bar_width, label='After Removal')
+            ax.set_xticks(indices + bar_width / 2)
+        else:
+            ax.set_xticks(indices)
+        ax.set_xticklabels(counts.index, rotation=45)
+
+        ax.set_xlabel('Columns')
+        ax.set_ylabel('Count of NULL Values')
+        ax.set_title('Count of NULL Values Before and After Removal' if after is not None else 'Count of NULL Values')
+        ax.legend()
+        ax.grid(True)
+        plt.tight_layout()
+        plt.show()
+    
+    def plot_boxplot(self, columns, aggregated=False, sample_size=None):
+        """
+        Plot a boxplot of each column.
+        
+        :param columns: Columns to plot.
+        :param aggregated: Whether to draw from the pre-aggregated statistics of `summarise` instead of
+        passing every row to seaborn, which keeps plot time flat as the data grows.
+        :param sample_size: Optional number of rows to sample before aggregating.
+        """
+        if aggregated:
+            self.plot_summaries(self.summarise(columns, sample_size=sample_size), 'boxplot')
+            return
+        for col in columns:
+            plt.figure(figsize=(8, 6))
+            sns.boxplot(x=self.data_frame[col])
+            plt.title(f'Boxplot of {col}')
+            plt.show()
+
+    def plot_histogram(self, columns, aggregated=False, sample_size=None):
+        """
+        Plot a histogram with a KDE of each column.
+        
+        :param columns: Columns to plot.
+        :param aggregated: Whether to draw from the pre-aggregated bins and binned KDE of `summarise`
+        instead of passing every row to seaborn.
+        :param sample_size: Optional number of rows to sample before aggregating.
+        """
+        if aggregated:
+            self.plot_summaries(self.summarise(columns, bins=20, sample_size=sample_size), 'histogram')
+            return
+        for col in columns:
+            plt.figure(figsize=(8, 6))
+            sns.histplot(self.data_frame[col], bins=20, kde=True)
+            plt.title(f'Histogram of {col}')
+            plt.show()
+
+    def plot_skewness(self, columns):
+        for col in columns:
+            plt.figure(figsize=(10, 6))
+            sns.histplot(self.data_frame[col], kde=True)
+            plt.title(f'Skewness of {col}: {self.data_frame[col].skew():.2f}')
+            plt.show()
+
+    @staticmethod
+    def plot_correlation_matrix(corr_matrix):
+        """
+        Plot a heatmap of a correlation matrix with annotations, e.g. from
+        `DataFrameTransform.compute_correlation_matrix`.
+        """
+        plt.figure(figsize=(10, 8))
+        sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', fmt=".2f", vmin=-1, vmax=1)
+        plt.title("Correlation Matrix Heatmap")
+        plt.show()
+
+    def summarise(self, columns=None, bins=20, sample_size=None, random_state=0, resolution=8):
+        """
+        The function `summarise` pre-aggregates everything the histogram, KDE and box-plot charts need
+        for all the given columns in one vectorised pass: `bins * resolution` fine bins per column
+        (filled with a single `np.bincount`), moments and quantile sketches. Charts are then drawn from
+        these summaries, independently of the number of rows.
+        
+        :param columns: Columns to summarise, defaults to all numerical columns.
+        :param bins: Number of histogram bins shown.
+        :param sample_size: Optional number of rows to sample (without replacement) first.
+        :param random_state: Seed used for sampling.
+        :param resolution: Number of fine bins per shown bin used for the KDE.
+        :return: Dictionary mapping each column with data to its chart summary.
+        """
+        if columns is None:
+            columns = self.data_frame.select_dtypes(include=['number']).columns
+        frame = self.data_frame[list(columns)]
+        if sample_size is not None and len(frame) > sample_size:
+            frame = frame.sample(sample_size, random_state=random_state)
+        minimum, maximum = frame.min(), frame.max()
+        ranges = {col: (minimum[col], maximum[col]) for col in frame.columns if pd.notna(minimum[col])}
+        histograms = HistogramAccumulator(ranges, bins=bins * resolution, seed=random_state)
+        histograms.update(frame)
+        return _chart_summaries(histograms, bins)
+
+    @staticmethod
+    def summarise_chunks(chunks, ranges, bins=20, resolution=8):
+        """
+        Build the same summaries as `summarise` from a stream of DataFrames, e.g. from
+        `RDSDatabaseConnector.fetch_data_in_chunks`, without holding the data in memory.
+        
+        :param chunks: Iterable of DataFrames.
+        :param ranges: Dictionary mapping each column to chart to its `(lower, upper)` histogram range,
+        e.g. from a previous `StreamingStatistics` pass; values outside it are left out of the bins.
+        :param bins: Number of histogram bins shown.
+        :param resolution: Number of fine bins per shown bin used for the KDE.
+        :return: Dictionary mapping each column with data to its chart summary.
+        """
+        histograms = HistogramAccumulator(ranges, bins=bins * resolution)
+        for chunk in chunks:
+            histograms.update(chunk)
+        return _chart_summaries(histograms, bins)
+
+    @staticmethod
+    def plot_summaries(summaries, kind='histogram'):
+        """
+        Plot one chart per column from summaries built by `summarise` or `summarise_chunks`.
+        
+        :param summaries: Dictionary mapping columns to chart summaries.
+        :param kind: 'boxplot', 'histogram' or 'skewness'.
+        """
+        for col, summary in summaries.items():
+            _, axes = plt.subplots(figsize=(8, 6))
+            _draw_chart(axes, kind, col, summary)
+            plt.show()
+
+    def render_report(self, output_dir, columns=None, charts=('boxplot', 'histogram'), fmt='png', bins=20,
+                      sample_size=None, max_workers=None, html_report=True):
+        """
+        The function `render_report` renders the charts of `plot_boxplot` and `plot_histogram` (and the
+        skewness histograms of `DataFrameTransform.visualize_skewness`) for every column to image files,
+        without a display. The bins, box-plot statistics and KDE of every column are computed once, in
+        this process, by `summarise` and shared by all its charts; only those small summaries are sent
+        to a process pool that draws and saves the figures in parallel.
+        
+        :param output_dir: Directory the charts are written to; it is created if needed.
+        :param columns: Columns to chart, defaults to all numerical columns.
+        :param charts: Kinds of chart to render for each column: 'boxplot', 'histogram' and/or 'skewness'.
+        :param fmt: Image format, e.g. 'png' or 'svg'.
+        :param bins: Number of histogram bins.
+        :param sample_size: Optional number of rows to sample before aggregating, see `summarise`.
+        :param max_workers: Number of worker processes; 1 renders in this process.
+        :param html_report: Whether to also write a `report.html` page showing every chart.
+        :return: Path of the HTML report, or the list of chart paths if `html_report` is False.
+        """
+        if columns is None:
+            columns = self.data_frame.select_dtypes(include=['number']).columns
+        os.makedirs(output_dir, exist_ok=True)
+
+        summaries = self.summarise(columns, bins=bins, sample_size=sample_size)
+        tasks = []
+        for index, col in enumerate(columns):
+            if col not in summaries:
+                continue
+            for kind in charts:
+                tasks.append((kind, col, summaries[col], os.path.join(output_dir, f"{index:03d}_{kind}.{fmt}")))
+
+        if max_workers == 1 or len(tasks) <= 1:
+            paths = [_render_chart(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                paths = list(executor.map(_render_chart, *zip(*tasks)))
+
+        if not html_report:
+            return paths
+        sections = []
+        for (kind, col, _, _), path in zip(tasks, paths):
+            name = html.escape(os.path.basename(path))
+            sections.append(f'<figure><img src="{name}" alt="{html.escape(f"{kind} of {col}")}"></figure>')
+        report_path = os.path.join(output_dir, 'report.html')
+        with open(report_path, 'w') as file:
+            file.write('<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>Report</title></head><body>\n')
+            file.write('\n'.join(sections))
+            file.write('\n</body></html>\n')
+        return report_path
@@ -0,0 +1,141 @@
+import functools
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+
+def fingerprint(data_frame):
+    """
+    The function `fingerprint` returns a content hash of a DataFrame: its column names, dtypes, index
+    and values. Equal DataFrames have equal fingerprints, whatever object holds them.
+
+    :param data_frame: DataFrame to fingerprint.
+    :return: Hexadecimal SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(column), str(dtype)] for column, dtype in data_frame.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(data_frame, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class StepCache:
+    def __init__(self, cache_dir='.step_cache', max_bytes=2 * 1024 ** 3):
+        """
+        A content-addressed cache of the DataFrames produced by pipeline steps, stored on local disk
+        as Parquet. Each result is keyed on the step name, its parameters and the fingerprint of its
+        input DataFrame, so rerunning a fetch -> `DataTransform` -> `DataFrameTransform` chain only
+        recomputes the steps whose inputs or parameters changed. When the cache grows beyond
+        `max_bytes` the least recently used entries are evicted.
+
+        :param cache_dir: Directory holding the cached results.
+        :param max_bytes: Maximum total size of the cached files.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, step_name, params=None, data_frame=None):
+        """
+        Return the cache key of a step run.
+
+        :param step_name: Name identifying the step.
+        :param params: Dictionary of the step's parameters; values are compared by their JSON (or
+        string) representation.
+        :param data_frame: The step's input DataFrame, if any.
+        """
+        payload = {
+            'step': step_name,
+            'params': params or {},
+            'input': fingerprint(data_frame) if data_frame is not None else None,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def run(self, step_name, func, data_frame=None, **params):
+        """
+        The function `run` returns the cached result of `func` for this step name, input and
+        parameters, computing and storing it on a miss.
+
+        :param step_name: Name identifying the step, e.g. 'fetch' or 'impute'.
+        :param func: Callable returning a DataFrame, called as `func(data_frame, **params)`, or as
+        `func(**params)` when there is no input DataFrame.
+        :param data_frame: The step's input DataFrame, if any. It is not modified.
+        :param params: Keyword arguments passed to `func` and included in the key.
+        :return: The step's output DataFrame.
+        """
+        path = self._path(self.key(step_name, params, data_frame))
+        if os.path.exists(path):
+            self.hits += 1
+            # The modification time records the last use, for least-recently-used eviction.
+            os.utime(path)
+            return pd.read_parquet(path, engine='pyarrow')
+
+        self.misses += 1
+        result = func(data_frame.copy(), **params) if data_frame is not None else func(**params)
+        temporary_path = f"{path}.tmp"
+        result.to_parquet(temporary_path, engine='pyarrow')
+        os.replace(temporary_path, path)
+        self._evict()
+        return result
+
+    def cached(self, step_name):
+        """
+        Decorator form of `run`: the decorated function's first positional argument, if any, is the
+        input DataFrame and its keyword arguments are the parameters.
+
+        :param step_name: Name identifying the step.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(data_frame=None, **params):
+                return self.run(step_name, func, data_frame, **params)
+            return wrapper
+        return decorator
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.parquet'):
+                path = os.path.join(self.cache_dir, name)
+                status = os.stat(path)
+                entries.append((status.st_mtime, status.st_size, path))
+        return sorted(entries)
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        # Always keep the most recent entry, even if it alone exceeds the limit.
+        for _, size, path in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            self.evictions += 1
+
+    def stats(self):
+        """
+        Return the number of hits, misses and evictions so far, and the number and total size of the
+        cached entries.
+        """
+        entries = self._entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+        }
+
+    def clear(self):
+        """
+        Remove every cached entry.
+        """
+        for _, _, path in self._entries():
+            os.remove(path)
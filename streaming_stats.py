@@ -0,0 +1,568 @@
+import copy
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+class MomentAccumulator:
+    def __init__(self, columns):
+        """
+        Running count, mean, second and third central moments, minimum and maximum of a set of numeric
+        columns, updated one chunk at a time with the pairwise formulas of Chan et al. (a
+        generalisation of Welford's algorithm). Accumulators built on different chunks or in different
+        processes can be combined with `merge`; the result is exact up to floating-point rounding.
+
+        :param columns: Names of the numeric columns to track.
+        """
+        self.columns = list(columns)
+        size = len(self.columns)
+        self.count = np.zeros(size)
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.m3 = np.zeros(size)
+        self.minimum = np.full(size, np.nan)
+        self.maximum = np.full(size, np.nan)
+
+    def update(self, data_frame):
+        """
+        Add the rows of a chunk; missing values are ignored.
+
+        :param data_frame: DataFrame containing (at least) the tracked columns.
+        """
+        self.update_block(data_frame[self.columns].to_numpy(dtype=np.float64, na_value=np.nan))
+
+    def update_block(self, block):
+        """
+        Add the rows of a 2-D array with one column per tracked column; NaN values are ignored.
+        """
+        present = ~np.isnan(block)
+        count = present.sum(axis=0).astype(np.float64)
+        filled = np.where(present, block, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, filled.sum(axis=0) / count, 0.0)
+            centred = np.where(present, block - mean, 0.0)
+        chunk = MomentAccumulator(self.columns)
+        chunk.count = count
+        chunk.mean = mean
+        chunk.m2 = (centred ** 2).sum(axis=0)
+        chunk.m3 = (centred ** 3).sum(axis=0)
+        if len(block):
+            with np.errstate(invalid='ignore'):
+                chunk.minimum = np.where(count > 0, np.where(present, block, np.inf).min(axis=0), np.nan)
+                chunk.maximum = np.where(count > 0, np.where(present, block, -np.inf).max(axis=0), np.nan)
+        self.merge(chunk)
+
+    def merge(self, other):
+        """
+        Combine the moments of `other`, accumulated over different rows of the same columns, into this
+        accumulator.
+
+        :param other: Another `MomentAccumulator` with the same columns.
+        :return: This accumulator.
+        """
+        n_a, n_b = self.count, other.count
+        n = n_a + n_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = other.mean - self.mean
+            mean = np.where(n > 0, self.mean + delta * n_b / n, 0.0)
+            m2 = self.m2 + other.m2 + np.where(n > 0, delta ** 2 * n_a * n_b / n, 0.0)
+            m3 = (self.m3 + other.m3
+                  + np.where(n > 0, delta ** 3 * n_a * n_b * (n_a - n_b) / n ** 2, 0.0)
+                  + np.where(n > 0, 3 * delta * (n_a * other.m2 - n_b * self.m2) / n, 0.0))
+        self.count, self.mean, self.m2, self.m3 = n, mean, m2, m3
+        self.minimum = np.fmin(self.minimum, other.minimum)
+        self.maximum = np.fmax(self.maximum, other.maximum)
+        return self
+
+    def variance(self):
+        """
+        Sample variance (ddof=1) of each column, as `Series.var` computes it.
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return pd.Series(np.where(self.count > 1, self.m2 / (self.count - 1), np.nan), index=self.columns)
+
+    def skew(self):
+        """
+        Adjusted Fisher-Pearson skewness of each column, as `Series.skew` computes it.
+        """
+        n = self.count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            g1 = np.sqrt(n) * self.m3 / self.m2 ** 1.5
+            skew = np.sqrt(n * (n - 1)) / (n - 2) * g1
+        skew = np.where(n > 2, np.where(self.m2 > 0, skew, 0.0), np.nan)
+        return pd.Series(skew, index=self.columns)
+
+
+class QuantileSketch:
+    def __init__(self, k=200, seed=None):
+        """
+        A KLL quantile sketch (Karnin, Lang and Liberty, 2016) of a stream of numbers. It keeps a
+        hierarchy of compactors whose capacities shrink geometrically below the top level; a full
+        compactor is sorted and every other item, from a random offset, is promoted to the next level
+        with twice the weight. Memory is O(k) items regardless of the stream length.
+
+        The rank of the value returned for a quantile q is within roughly 1.7/k of q (about 1% of the
+        rows for the default k=200) with high probability, and the bound holds after any number of
+        `merge` calls.
+
+        :param k: Capacity of the top compactor, trading accuracy for memory.
+        :param seed: Optional seed for the random compaction offsets.
+        """
+        self.k = k
+        self.n = 0
+        self.compactors = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.compactors) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.compactors):
+            items = self.compactors[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays at this level so that no weight is lost.
+                kept, items = (items[-1:], items[:-1]) if len(items) % 2 else (items[:0], items)
+                promoted = items[self._rng.integers(2)::2]
+                self.compactors[level] = kept
+                self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], promoted])
+                # Adding a level lowers the capacity of the ones below it, so start again.
+                level = 0
+                continue
+            level += 1
+
+    def update(self, values):
+        """
+        Add values to the sketch; NaN values are ignored.
+
+        :param values: Array-like of numbers.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.n += len(values)
+            self.compactors[0] = np.concatenate([self.compactors[0], values])
+            self._compress()
+
+    def merge(self, other):
+        """
+        Combine another sketch of a different part of the stream into this one.
+
+        :param other: Another `QuantileSketch`, ideally with the same `k`.
+        :return: This sketch.
+        """
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0))
+        for level, items in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        """
+        Estimate the q-th quantile(s) of the stream.
+
+        :param q: A quantile or array of quantiles between 0 and 1.
+        :return: The estimated value(s), NaN if the sketch is empty.
+        """
+        scalar = np.ndim(q) == 0
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if self.n == 0:
+            result = np.full(len(q), np.nan)
+        else:
+            values = np.concatenate(self.compactors)
+            weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.compactors)])
+            order = np.argsort(values, kind='stable')
+            values, cumulative = values[order], np.cumsum(weights[order])
+            index = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+            result = values[np.clip(index, 0, len(values) - 1)]
+        return result[0] if scalar else result
+
+
+class HyperLogLog:
+    def __init__(self, precision=14):
+        """
+        A HyperLogLog distinct-value counter (Flajolet et al., 2007) with 2**precision registers over
+        the 64-bit hashes of `pandas.util.hash_pandas_object`. The relative standard error of the
+        estimate is 1.04 / sqrt(2**precision), 0.81% for the default precision of 14 (16 KiB of
+        registers); small cardinalities are counted with linear counting and are nearly exact.
+        Counters with the same precision can be merged across chunks and processes.
+
+        :param precision: Number of hash bits used to select a register, between 4 and 18.
+        """
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+
+    def update(self, values):
+        """
+        Add the values of a Series to the counter; missing values are ignored.
+
+        :param values: pandas Series.
+        """
+        values = values.dropna()
+        if not len(values):
+            return
+        if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+            # Hash numbers as float64 so a column read as int in one chunk and as float in another
+            # (because of missing values) hashes the same values identically.
+            values = values.astype(np.float64)
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        remainder = hashes << np.uint64(self.precision)
+        # Position of the leftmost 1-bit of the remaining 64 - precision bits.
+        bit_length = np.zeros(len(remainder), dtype=np.int64)
+        for shift in (32, 16, 8, 4, 2, 1):
+            high = remainder >= (np.uint64(1) << np.uint64(shift))
+            bit_length += high * shift
+            remainder = np.where(high, remainder >> np.uint64(shift), remainder)
+        bit_length += remainder > 0
+        rank = np.minimum(64 - bit_length + 1, 64 - self.precision + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        """
+        Combine another counter with the same precision into this one.
+
+        :param other: Another `HyperLogLog`.
+        :return: This counter.
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog counters with different precisions.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        """
+        Estimate the number of distinct values added.
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(2.0 ** -self.registers.astype(np.float64))
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class StreamingStatistics:
+    def __init__(self, k=200, precision=14, seed=None):
+        """
+        Out-of-core counterpart of the statistics used by `DataFrameInfo` and `DataFrameTransform`:
+        moments, quantiles and distinct counts accumulated chunk by chunk (e.g. from
+        `RDSDatabaseConnector.fetch_data_in_chunks`) and mergeable across processes. Means, standard
+        deviations and skewness are exact; quantiles and distinct counts are estimates with the error
+        bounds documented on `QuantileSketch` and `HyperLogLog`.
+
+        :param k: Accuracy parameter of the quantile sketches.
+        :param precision: Precision of the distinct-value counters.
+        :param seed: Optional seed for the quantile sketches.
+        """
+        self.k = k
+        self.precision = precision
+        self.seed = seed
+        self.n_rows = 0
+        self.moments = None
+        self.sketches = {}
+        self.distinct = {}
+        self.null_counts = {}
+
+    @classmethod
+    def from_chunks(cls, chunks, **kwargs):
+        """
+        Build the statistics of a stream of DataFrames.
+
+        :param chunks: Iterable of DataFrames with the same columns.
+        :return: A `StreamingStatistics`.
+        """
+        statistics = cls(**kwargs)
+        for chunk in chunks:
+            statistics.update(chunk)
+        return statistics
+
+    def update(self, data_frame):
+        """
+        Add the rows of a chunk. The numeric columns are taken from the first chunk.
+
+        :param data_frame: DataFrame chunk.
+        """
+        if self.moments is None:
+            numeric_columns = data_frame.select_dtypes(include=['number'], exclude=['bool']).columns
+            self.moments = MomentAccumulator(numeric_columns)
+            self.sketches = {column: QuantileSketch(self.k, self.seed) for column in numeric_columns}
+        self.n_rows += len(data_frame)
+        self.moments.update(data_frame)
+        for column, sketch in self.sketches.items():
+            sketch.update(data_frame[column].to_numpy(dtype=np.float64, na_value=np.nan))
+        for column in data_frame.columns:
+            self.distinct.setdefault(column, HyperLogLog(self.precision)).update(data_frame[column])
+        for column, count in data_frame.isnull().sum().items():
+            self.null_counts[column] = self.null_counts.get(column, 0) + int(count)
+
+    def merge(self, other):
+        """
+        Combine the statistics of another part of the same table into these.
+
+        :param other: Another `StreamingStatistics`.
+        :return: These statistics.
+        """
+        if other.moments is None:
+            return self
+        if self.moments is None:
+            self.moments = MomentAccumulator(other.moments.columns)
+            self.sketches = {column: QuantileSketch(self.k, self.seed) for column in other.moments.columns}
+        self.n_rows += other.n_rows
+        self.moments.merge(other.moments)
+        for column, sketch in other.sketches.items():
+            self.sketches[column].merge(sketch)
+        for column, counter in other.distinct.items():
+            self.distinct.setdefault(column, HyperLogLog(self.precision)).merge(counter)
+        for column, count in other.null_counts.items():
+            self.null_counts[column] = self.null_counts.get(column, 0) + count
+        return self
+
+    def quantiles(self, q):
+        """
+        Estimate quantiles of every numeric column.
+
+        :param q: A quantile or list of quantiles between 0 and 1.
+        :return: Series (for a single quantile) or DataFrame indexed by quantile.
+        """
+        if np.ndim(q) == 0:
+            return pd.Series({column: sketch.quantile(q) for column, sketch in self.sketches.items()}, dtype=float)
+        return pd.DataFrame({column: sketch.quantile(q) for column, sketch in self.sketches.items()}, index=list(q))
+
+    def get_statistics(self):
+        """
+        Mean, (estimated) median and standard deviation of the numeric columns, as returned by
+        `DataFrameInfo.get_statistics`.
+        """
+        return {
+            'mean': pd.Series(self.moments.mean, index=self.moments.columns).where(self.moments.count > 0),
+            'median': self.quantiles(0.5),
+            'std_dev': np.sqrt(self.moments.variance()),
+        }
+
+    def skewness(self):
+        """
+        Skewness of each numeric column, as `DataFrame.skew` computes it.
+        """
+        return self.moments.skew()
+
+    def identify_skewed_columns(self, skew_threshold=0.75):
+        """
+        Columns whose absolute skewness exceeds `skew_threshold`, as returned by
+        `DataFrameTransform.identify_skewed_columns`.
+        """
+        skewness = self.skewness()
+        return skewness[abs(skewness) > skew_threshold].index.tolist()
+
+    def iqr_bounds(self, threshold=1.5):
+        """
+        Lower and upper outlier bounds of each numeric column for the IQR method of
+        `DataFrameTransform.remove_outliers`, from the estimated quartiles.
+
+        :return: DataFrame indexed by column with `lower` and `upper` bounds.
+        """
+        quartiles = self.quantiles([0.25, 0.75])
+        iqr = quartiles.loc[0.75] - quartiles.loc[0.25]
+        return pd.DataFrame({'lower': quartiles.loc[0.25] - threshold * iqr,
+                             'upper': quartiles.loc[0.75] + threshold * iqr})
+
+    def count_distinct_values(self, columns=None):
+        """
+        Estimated number of distinct values of each column (or of `columns`).
+        """
+        columns = list(self.distinct) if columns is None else columns
+        return {column: self.distinct[column].count() for column in columns}
+
+    def count_null_values(self):
+        """
+        Count and percentage of NULL values in each column, as returned by
+        `DataFrameInfo.count_null_values`.
+        """
+        null_counts = pd.Series(self.null_counts, dtype='int64')
+        return pd.DataFrame({'null_count': null_counts,
+                             'null_percentage': null_counts / self.n_rows * 100 if self.n_rows else 0.0})
+
+
+class CorrelationAccumulator:
+    def __init__(self, columns):
+        """
+        Pairwise Pearson correlations of a set of numeric columns, accumulated chunk by chunk. Each
+        chunk is standardised into a float32 matrix and reduced with a handful of float32 BLAS matrix
+        products to sums over the rows where both columns of a pair are present; only the running
+        totals across chunks are kept in float64. The result therefore equals `DataFrame.corr()`
+        (pairwise-complete observations) to float32 precision, typically within 1e-6. Accumulators
+        over different rows can be combined with `merge`.
+
+        :param columns: Names of the numeric columns.
+        """
+        self.columns = list(columns)
+        size = len(self.columns)
+        self.shift = None
+        self.scale = None
+        self.n = np.zeros((size, size))
+        self.sx = np.zeros((size, size))
+        self.sxx = np.zeros((size, size))
+        self.sxy = np.zeros((size, size))
+
+    def update(self, data_frame):
+        """
+        Add the rows of a chunk; missing values are excluded pair by pair.
+
+        :param data_frame: DataFrame containing (at least) the tracked columns.
+        """
+        block = data_frame[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        if self.shift is None:
+            # Standardising with the first chunk's moments keeps the float32 products well conditioned.
+            with np.errstate(invalid='ignore'), warnings.catch_warnings():
+                warnings.simplefilter('ignore', category=RuntimeWarning)
+                shift = np.nanmean(block, axis=0)
+                scale = np.nanstd(block, axis=0)
+            self.shift = np.nan_to_num(shift)
+            self.scale = np.where(np.isfinite(scale) & (scale > 0), scale, 1.0)
+
+        present = ~np.isnan(block)
+        values = np.where(present, (block - self.shift) / self.scale, 0.0).astype(np.float32)
+        self.sxy += values.T @ values
+        if present.all():
+            self.n += len(values)
+            self.sx += values.sum(axis=0, dtype=np.float64)[:, None]
+            self.sxx += (values.astype(np.float64) ** 2).sum(axis=0)[:, None]
+        else:
+            mask = present.astype(np.float32)
+            self.n += mask.T @ mask
+            self.sx += values.T @ mask
+            self.sxx += (values * values).T @ mask
+
+    def _rebase(self, shift, scale):
+        """
+        Re-expresses the accumulated sums in terms of another standardisation.
+        """
+        ratio = self.scale / scale
+        offset = (self.shift - shift) / scale
+        sx = ratio[:, None] * self.sx + offset[:, None] * self.n
+        self.sxx = (ratio[:, None] ** 2 * self.sxx + 2 * (ratio * offset)[:, None] * self.sx
+                    + offset[:, None] ** 2 * self.n)
+        self.sxy = (np.outer(ratio, ratio) * self.sxy + ratio[:, None] * offset[None, :] * self.sx
+                    + offset[:, None] * ratio[None, :] * self.sx.T + np.outer(offset, offset) * self.n)
+        self.sx = sx
+        self.shift, self.scale = shift, scale
+
+    def merge(self, other):
+        """
+        Combine another accumulator over different rows of the same columns into this one.
+
+        :param other: Another `CorrelationAccumulator`.
+        :return: This accumulator.
+        """
+        if other.shift is None:
+            return self
+        if self.shift is None:
+            self.shift, self.scale = other.shift, other.scale
+        elif not (np.array_equal(self.shift, other.shift) and np.array_equal(self.scale, other.scale)):
+            other = copy.deepcopy(other)
+            other._rebase(self.shift, self.scale)
+        self.n += other.n
+        self.sx += other.sx
+        self.sxx += other.sxx
+        self.sxy += other.sxy
+        return self
+
+    def correlation(self):
+        """
+        The correlation matrix of the accumulated rows.
+
+        :return: DataFrame indexed and labelled by column, with NaN where a pair has fewer than two
+        common observations or no variance.
+        """
+        n, sx, sxx, sxy = self.n, self.sx, self.sxx, self.sxy
+        with np.errstate(invalid='ignore', divide='ignore'):
+            covariance = n * sxy - sx * sx.T
+            variance = n * sxx - sx ** 2
+            correlation = covariance / np.sqrt(variance * variance.T)
+        valid = (n > 1) & (variance > 0) & (variance.T > 0)
+        correlation = np.where(valid, np.clip(correlation, -1.0, 1.0), np.nan)
+        diagonal = np.diag_indices_from(correlation)
+        correlation[diagonal] = np.where(valid[diagonal], 1.0, np.nan)
+        return pd.DataFrame(correlation, index=self.columns, columns=self.columns)
+
+
+class HistogramAccumulator:
+    def __init__(self, ranges, bins=160, k=200, seed=None):
+        """
+        Fixed-width histograms of a set of numeric columns, together with their moments and quantile
+        sketches, accumulated chunk by chunk. All columns of a chunk are binned with a single
+        `np.bincount`, so the cost per chunk is one vectorised pass however many columns there are.
+        Values outside a column's range are counted in `below` / `above` instead of a bin.
+
+        :param ranges: Dictionary mapping each column to its `(lower, upper)` range.
+        :param bins: Number of bins per column.
+        :param k: Accuracy parameter of the quantile sketches.
+        :param seed: Optional seed for the quantile sketches.
+        """
+        self.columns = list(ranges)
+        self.bins = bins
+        self.lower = np.array([float(ranges[column][0]) for column in self.columns])
+        self.upper = np.array([float(ranges[column][1]) for column in self.columns])
+        self.upper = np.where(self.upper > self.lower, self.upper, self.lower + 1.0)
+        self.counts = np.zeros((len(self.columns), bins), dtype=np.int64)
+        self.below = np.zeros(len(self.columns), dtype=np.int64)
+        self.above = np.zeros(len(self.columns), dtype=np.int64)
+        self.moments = MomentAccumulator(self.columns)
+        self.sketches = {column: QuantileSketch(k, seed) for column in self.columns}
+
+    def edges(self, column):
+        """
+        Bin edges of `column`.
+        """
+        index = self.columns.index(column)
+        return np.linspace(self.lower[index], self.upper[index], self.bins + 1)
+
+    def update(self, data_frame):
+        """
+        Add the rows of a chunk; missing values are ignored.
+
+        :param data_frame: DataFrame containing (at least) the tracked columns.
+        """
+        self.update_block(data_frame[self.columns].to_numpy(dtype=np.float64, na_value=np.nan))
+
+    def update_block(self, block):
+        """
+        Add the rows of a 2-D array with one column per tracked column; NaN values are ignored.
+        """
+        self.moments.update_block(block)
+        with np.errstate(invalid='ignore'):
+            position = (block - self.lower) / (self.upper - self.lower) * self.bins
+            self.below += (position < 0).sum(axis=0)
+            self.above += (position > self.bins).sum(axis=0)
+            inside = (position >= 0) & (position <= self.bins)
+        index = np.minimum(np.floor(np.where(inside, position, 0)).astype(np.int64), self.bins - 1)
+        flat = (index + np.arange(len(self.columns)) * self.bins)[inside]
+        self.counts += np.bincount(flat, minlength=self.counts.size).reshape(self.counts.shape)
+        for position, column in enumerate(self.columns):
+            self.sketches[column].update(block[:, position])
+
+    def merge(self, other):
+        """
+        Combine another accumulator with the same columns, ranges and bins into this one.
+
+        :param other: Another `HistogramAccumulator`.
+        :return: This accumulator.
+        """
+        if not (np.array_equal(self.lower, other.lower) and np.array_equal(self.upper, other.upper)
+                and self.bins == other.bins):
+            raise ValueError("Cannot merge histograms with different ranges or bins.")
+        self.counts += other.counts
+        self.below += other.below
+        self.above += other.above
+        self.moments.merge(other.moments)
+        for column, sketch in other.sketches.items():
+            self.sketches[column].merge(sketch)
+        return self
@@ -0,0 +1,213 @@
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+# Categories of the `loan_payments` table, with their approximate frequencies.
+GRADES = ['A', 'B', 'C', 'D', 'E', 'F', 'G']
+GRADE_WEIGHTS = [0.17, 0.30, 0.25, 0.15, 0.08, 0.04, 0.01]
+EMPLOYMENT_LENGTHS = ['< 1 year', '1 year', '2 years', '3 years', '4 years', '5 years', '6 years', '7 years',
+                      '8 years', '9 years', '10+ years']
+EMPLOYMENT_WEIGHTS = [0.08, 0.07, 0.09, 0.08, 0.07, 0.07, 0.06, 0.05, 0.05, 0.04, 0.34]
+HOME_OWNERSHIPS = ['MORTGAGE', 'RENT', 'OWN', 'OTHER', 'NONE']
+HOME_OWNERSHIP_WEIGHTS = [0.49, 0.41, 0.097, 0.002, 0.001]
+VERIFICATION_STATUSES = ['Verified', 'Source Verified', 'Not Verified']
+VERIFICATION_WEIGHTS = [0.35, 0.33, 0.32]
+LOAN_STATUSES = ['Fully Paid', 'Current', 'Charged Off', 'Late (31-120 days)', 'In Grace Period',
+                 'Late (16-30 days)', 'Default', 'Does not meet the credit policy. Status:Fully Paid',
+                 'Does not meet the credit policy. Status:Charged Off']
+LOAN_STATUS_WEIGHTS = [0.51, 0.36, 0.10, 0.01, 0.006, 0.002, 0.001, 0.0075, 0.0035]
+PURPOSES = ['debt_consolidation', 'credit_card', 'home_improvement', 'other', 'major_purchase',
+            'small_business', 'car', 'medical', 'moving', 'vacation', 'house', 'wedding', 'renewable_energy',
+            'educational']
+PURPOSE_WEIGHTS = [0.58, 0.21, 0.06, 0.05, 0.025, 0.02, 0.015, 0.01, 0.008, 0.006, 0.005, 0.005, 0.003,
+                   0.003]
+
+# Fraction of NULL values in the columns of the table that have them.
+NULL_FRACTIONS = {
+    'funded_amount': 0.055,
+    'term': 0.088,
+    'int_rate': 0.095,
+    'employment_length': 0.039,
+    'mths_since_last_delinq': 0.57,
+    'mths_since_last_record': 0.886,
+    'last_payment_date': 0.0013,
+    'next_payment_date': 0.60,
+    'last_credit_pull_date': 0.0002,
+    'collections_12_mths_ex_med': 0.0009,
+    'mths_since_last_major_derog': 0.862,
+}
+
+# Money columns rendered as strings such as '$12,000.00' when `currency_strings` is set.
+CURRENCY_COLUMNS = ['loan_amount', 'funded_amount', 'funded_amount_inv', 'instalment', 'annual_inc',
+                    'last_payment_amount']
+
+# Months used for the date columns, stored as 'Jan-2021' strings as in the raw table.
+_MONTHS = pd.period_range('1990-01', '2022-12', freq='M')
+_MONTH_LABELS = np.array(_MONTHS.strftime('%b-%Y'), dtype=object)
+
+
+def _month_labels(month_index):
+    return _MONTH_LABELS[np.clip(month_index, 0, len(_MONTH_LABELS) - 1)]
+
+
+def generate_loan_payments(n_rows, seed=0, start_id=1, currency_strings=False):
+    """
+    The function `generate_loan_payments` generates a synthetic DataFrame with the columns, raw dtypes,
+    value formats and NULL fractions of the `loan_payments` table: term strings such as '36 months',
+    dates as 'Jan-2021' strings, right-skewed amounts and categorical columns with realistic
+    frequencies. The same `n_rows`, `seed` and `start_id` always give the same data.
+
+    :param n_rows: Number of rows to generate.
+    :param seed: Seed of the random generator.
+    :param start_id: First value of the `id` column.
+    :param currency_strings: Whether to render the money columns (`CURRENCY_COLUMNS`) as currency strings
+    such as '$12,000.00', to exercise symbol removal.
+    :return: DataFrame with one row per loan.
+    """
+    rng = np.random.default_rng(seed)
+    ids = np.arange(start_id, start_id + n_rows, dtype=np.int64)
+
+    grade_index = rng.choice(len(GRADES), n_rows, p=GRADE_WEIGHTS)
+    grades = np.array(GRADES, dtype=object)[grade_index]
+    sub_grades = grades + rng.integers(1, 6, n_rows).astype(str).astype(object)
+    term_months = np.where(rng.random(n_rows) < 0.7, 36, 60)
+
+    loan_amount = np.clip(np.round(rng.lognormal(9.3, 0.6, n_rows) / 25) * 25, 500, 35000).astype(np.int64)
+    funded_amount = np.minimum(loan_amount, loan_amount * rng.uniform(0.9, 1.0, n_rows)).round(2)
+    funded_amount_inv = np.clip(funded_amount - rng.exponential(150, n_rows), 0, None).round(2)
+    int_rate = np.round(6 + grade_index * 3.2 + rng.normal(0, 1.2, n_rows), 2)
+    monthly_rate = int_rate / 1200
+    instalment = np.round(loan_amount * monthly_rate / (1 - (1 + monthly_rate) ** -term_months), 2)
+
+    issue_month = rng.integers(len(_MONTHS) - 180, len(_MONTHS), n_rows)
+    earliest_credit_month = issue_month - rng.integers(36, 360, n_rows)
+    paid_months = np.minimum(rng.integers(0, term_months + 1), len(_MONTHS) - 1 - issue_month)
+    last_payment_month = issue_month + paid_months
+    total_payment = np.round(instalment * paid_months * rng.uniform(0.95, 1.05, n_rows), 2)
+    total_rec_int = np.round(total_payment * rng.uniform(0.1, 0.3, n_rows), 2)
+    outstanding = np.clip(loan_amount - (total_payment - total_rec_int), 0, None).round(2)
+    charged_off = rng.random(n_rows) < 0.1
+    recoveries = np.where(charged_off, np.round(rng.exponential(800, n_rows), 2), 0.0)
+
+    data_frame = pd.DataFrame({
+        'id': ids,
+        'member_id': ids + 1000000,
+        'loan_amount': loan_amount,
+        'funded_amount': funded_amount,
+        'funded_amount_inv': funded_amount_inv,
+        'term': np.where(term_months == 36, '36 months', '60 months').astype(object),
+        'int_rate': int_rate,
+        'instalment': instalment,
+        'grade': grades,
+        'sub_grade': sub_grades,
+        'employment_length': np.array(EMPLOYMENT_LENGTHS, dtype=object)[
+            rng.choice(len(EMPLOYMENT_LENGTHS), n_rows, p=EMPLOYMENT_WEIGHTS)],
+        'home_ownership': np.array(HOME_OWNERSHIPS, dtype=object)[
+            rng.choice(len(HOME_OWNERSHIPS), n_rows, p=HOME_OWNERSHIP_WEIGHTS)],
+        'annual_inc': np.round(rng.lognormal(11.0, 0.55, n_rows), -2),
+        'verification_status': np.array(VERIFICATION_STATUSES, dtype=object)[
+            rng.choice(len(VERIFICATION_STATUSES), n_rows, p=VERIFICATION_WEIGHTS)],
+        'issue_date': _month_labels(issue_month),
+        'loan_status': np.array(LOAN_STATUSES, dtype=object)[
+            rng.choice(len(LOAN_STATUSES), n_rows, p=LOAN_STATUS_WEIGHTS)],
+        'payment_plan': np.where(rng.random(n_rows) < 0.0001, 'y', 'n').astype(object),
+        'purpose': np.array(PURPOSES, dtype=object)[rng.choice(len(PURPOSES), n_rows, p=PURPOSE_WEIGHTS)],
+        'dti': np.round(rng.gamma(4.0, 4.0, n_rows), 2),
+        'delinq_2yrs': rng.poisson(0.25, n_rows),
+        'earliest_credit_line': _month_labels(earliest_credit_month),
+        'inq_last_6mths': rng.poisson(0.8, n_rows),
+        'mths_since_last_delinq': rng.integers(0, 150, n_rows).astype(np.float64),
+        'mths_since_last_record': rng.integers(0, 130, n_rows).astype(np.float64),
+        'open_accounts': rng.poisson(10, n_rows) + 1,
+        'total_accounts': rng.poisson(23, n_rows) + 2,
+        'out_prncp': outstanding,
+        'out_prncp_inv': outstanding,
+        'total_payment': total_payment,
+        'total_payment_inv': np.round(total_payment * funded_amount_inv / np.maximum(funded_amount, 1), 2),
+        'total_rec_prncp': np.round(total_payment - total_rec_int, 2),
+        'total_rec_int': total_rec_int,
+        'total_rec_late_fee': np.where(rng.random(n_rows) < 0.03, np.round(rng.exponential(20, n_rows), 2), 0.0),
+        'recoveries': recoveries,
+        'collection_recovery_fee': np.round(recoveries * rng.uniform(0, 0.2, n_rows), 2),
+        'last_payment_date': _month_labels(last_payment_month),
+        'last_payment_amount': np.round(instalment * rng.lognormal(0, 0.8, n_rows), 2),
+        'next_payment_date': _month_labels(last_payment_month + 1),
+        'last_credit_pull_date': _month_labels(last_payment_month + rng.integers(0, 12, n_rows)),
+        'collections_12_mths_ex_med': (rng.random(n_rows) < 0.004).astype(np.float64),
+        'mths_since_last_major_derog': rng.integers(0, 150, n_rows).astype(np.float64),
+        'policy_code': np.ones(n_rows, dtype=np.int64),
+        'application_type': np.full(n_rows, 'INDIVIDUAL', dtype=object),
+    })
+
+    for column, fraction in NULL_FRACTIONS.items():
+        data_frame.loc[rng.random(n_rows) < fraction, column] = None
+
+    if currency_strings:
+        for column in CURRENCY_COLUMNS:
+            values = data_frame[column]
+            data_frame[column] = values.map('${:,.2f}'.format, na_action='ignore')
+    return data_frame
+
+
+def generate_loan_payments_chunks(n_rows, chunk_size=1000000, seed=0, currency_strings=False):
+    """
+    Generate `n_rows` synthetic `loan_payments` rows as a stream of DataFrames, so tables far larger
+    than memory (e.g. 50M rows) can be written out. The `id` column runs on across chunks and each chunk
+    is seeded from `seed` and its position, so the output does not depend on the consumer.
+
+    :param n_rows: Total number of rows.
+    :param chunk_size: Maximum number of rows per DataFrame.
+    :param seed: Seed of the random generator.
+    :param currency_strings: Whether to render the money columns as currency strings.
+    :return: A generator of DataFrames.
+    """
+    for index, start in enumerate(range(0, n_rows, chunk_size)):
+        yield generate_loan_payments(min(chunk_size, n_rows - start), seed=(seed, index), start_id=start + 1,
+                                     currency_strings=currency_strings)
+
+
+def write_loan_payments_csv(file_path, n_rows, chunk_size=1000000, seed=0, currency_strings=False):
+    """
+    Write `n_rows` synthetic `loan_payments` rows to a CSV file, one chunk at a time.
+
+    :param file_path: Destination path.
+    :param n_rows: Total number of rows.
+    :param chunk_size: Number of rows generated and written at a time.
+    :param seed: Seed of the random generator.
+    :param currency_strings: Whether to render the money columns as currency strings.
+    """
+    for index, chunk in enumerate(generate_loan_payments_chunks(n_rows, chunk_size, seed, currency_strings)):
+        chunk.to_csv(file_path, mode='w' if index == 0 else 'a', header=index == 0, index=False)
+
+
+def write_loan_payments_sqlite(file_path, n_rows, table='loan_payments', chunk_size=1000000, seed=0):
+    """
+    Write `n_rows` synthetic `loan_payments` rows to a table of a SQLite database, a local stand-in for
+    the RDS database (e.g. `RDSDatabaseConnector.initialise_engine(connection_string='sqlite:///...')`).
+    An existing table of the same name is replaced.
+
+    :param file_path: Path of the SQLite database file.
+    :param n_rows: Total number of rows.
+    :param table: Name of the table.
+    :param chunk_size: Number of rows generated and written at a time.
+    :param seed: Seed of the random generator.
+    """
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(file_path)
+    try:
+        for index, chunk in enumerate(generate_loan_payments_chunks(n_rows, chunk_size, seed)):
+            chunk.to_sql(table, connection, if_exists='replace' if index == 0 else 'append', index=False,
+                         chunksize=100000)
+        connection.commit()
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    data_frame = generate_loan_payments(10000)
+    print(data_frame.head())
+    print(data_frame.isnull().mean().round(3))
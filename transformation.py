@@ -1,7 +1,221 @@
+import functools
+import hashlib
+import logging
+import re
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
-import matplotlib.pyplot as plt
 import pandas as pd
-import seaborn as sns
+
+from streaming_stats import CorrelationAccumulator
+
+logger = logging.getLogger(__name__)
+
+# Target dtypes for the raw `loan_payments` table, for use with `DataTransform.apply_schema`. Each
+# entry maps a column to its target `dtype` ('datetime', 'numeric', 'category' or any dtype accepted
+# by `astype`), an optional explicit datetime `format` and optional `symbols` to strip first.
+LOAN_PAYMENTS_SCHEMA = {
+    'issue_date': {'dtype': 'datetime', 'format': '%b-%Y'},
+    'earliest_credit_line': {'dtype': 'datetime', 'format': '%b-%Y'},
+    'last_payment_date': {'dtype': 'datetime', 'format': '%b-%Y'},
+    'next_payment_date': {'dtype': 'datetime', 'format': '%b-%Y'},
+    'last_credit_pull_date': {'dtype': 'datetime', 'format': '%b-%Y'},
+    'term': {'dtype': 'numeric', 'symbols': [' months']},
+    'employment_length': {'dtype': 'category'},
+    'grade': {'dtype': 'category'},
+    'sub_grade': {'dtype': 'category'},
+    'home_ownership': {'dtype': 'category'},
+    'verification_status': {'dtype': 'category'},
+    'loan_status': {'dtype': 'category'},
+    'payment_plan': {'dtype': 'category'},
+    'purpose': {'dtype': 'category'},
+    'application_type': {'dtype': 'category'},
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _symbol_pattern(symbols):
+    """
+    Compiles a single regular expression matching any of `symbols`: a character class when every
+    symbol is a single character, otherwise an alternation with the longest symbols first.
+    """
+    symbols = sorted({symbol for symbol in symbols if symbol}, key=len, reverse=True)
+    if all(len(symbol) == 1 for symbol in symbols):
+        return re.compile('[' + ''.join(re.escape(symbol) for symbol in symbols) + ']')
+    return re.compile('|'.join(re.escape(symbol) for symbol in symbols))
+
+
+def _remove_symbols(series, symbols, cardinality_threshold=0.1, sample_size=10000):
+    """
+    Returns `series` with every occurrence of each of `symbols` removed from its string values, in
+    one regular-expression pass. Categorical columns, and string columns whose distinct values are
+    at most `cardinality_threshold` of the rows (estimated on the first `sample_size` rows), are
+    cleaned on their distinct values only and mapped back to the rows.
+    """
+    symbols = tuple(symbols)
+    if not any(symbols):
+        return series
+    pattern = _symbol_pattern(symbols)
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        cleaned = pd.Series(categories).str.replace(pattern, '', regex=True)
+        if cleaned.is_unique and cleaned.notna().all():
+            return series.cat.rename_categories(cleaned.tolist())
+        return series.map(dict(zip(categories, cleaned)))
+
+    sample = series.iloc[:sample_size]
+    if len(sample) and sample.nunique() <= cardinality_threshold * len(sample):
+        codes, uniques = pd.factorize(series)
+        cleaned = pd.Series(uniques).str.replace(pattern, '', regex=True).to_numpy(dtype=object)
+        values = np.where(codes >= 0, cleaned[np.maximum(codes, 0)] if len(cleaned) else None,
+                          series.to_numpy(dtype=object))
+        return pd.Series(values, index=series.index, name=series.name, dtype=object)
+    return series.str.replace(pattern, '', regex=True)
+
+
+def _stratified_sample(values, sample_size):
+    """
+    Returns at most `sample_size` non-missing values of `values`, taken at evenly spaced ranks of the
+    sorted values so that every part of the distribution, tails included, is represented.
+    """
+    values = values[~np.isnan(values)]
+    if len(values) <= sample_size:
+        return values
+    ordered = np.sort(values)
+    return ordered[np.linspace(0, len(ordered) - 1, sample_size).round().astype(np.int64)]
+
+
+def _fit_transformation(transformation, values):
+    """
+    Fits a skew-correcting transformation to `values`, returning its parameters or None if there
+    are no values or they fall outside the transformation's domain.
+    """
+    if not len(values):
+        return None
+    if transformation == 'log':
+        return {'transformation': 'log'} if values.min() > -1 else None
+    if transformation == 'sqrt':
+        return {'transformation': 'sqrt'} if values.min() >= 0 else None
+    if transformation == 'boxcox':
+        if values.min() <= -1 or np.ptp(values) == 0:
+            return None
+        import scipy.stats
+
+        return {'transformation': 'boxcox', 'lambda': float(scipy.stats.boxcox(values + 1)[1])}
+    raise ValueError("Unsupported transformation")
+
+
+def _apply_fitted_transformation(values, params):
+    """
+    Applies a transformation fitted by `_fit_transformation` to `values`.
+    """
+    if params['transformation'] == 'log':
+        return np.log1p(values)
+    if params['transformation'] == 'sqrt':
+        return np.sqrt(values)
+    if params['transformation'] == 'boxcox':
+        import scipy.special
+
+        return scipy.special.boxcox(values + 1, params['lambda'])
+    raise ValueError("Unsupported transformation")
+
+
+def _select_transformation(sample, transformations=('log', 'sqrt', 'boxcox'), min_reduction=0.01):
+    """
+    Returns the fitted parameters of the transformation that leaves `sample` least skewed, with the
+    skewness before and after, or None if no transformation applies or none reduces the absolute
+    skewness by at least the fraction `min_reduction`. Samples with two or fewer distinct values are
+    left alone, as no monotone transformation changes their skewness.
+    """
+    import scipy.stats
+
+    if len(np.unique(sample)) <= 2:
+        return None
+    skew_before = float(scipy.stats.skew(sample, bias=False))
+    best = None
+    for transformation in transformations:
+        params = _fit_transformation(transformation, sample)
+        if params is None:
+            continue
+        skewness = abs(scipy.stats.skew(_apply_fitted_transformation(sample, params), bias=False))
+        if skewness < abs(skew_before) * (1 - min_reduction) and (best is None or skewness < best['skew_after']):
+            best = {**params, 'skew_after': float(skewness), 'skew_before': skew_before}
+    return best
+
+
+def _columns_fingerprint(data_frame, columns):
+    """
+    Returns a content hash of the given columns: their names, dtypes and values, but not the index.
+    NumPy-backed columns are hashed from their raw buffers, without copying them into one block.
+    """
+    digest = hashlib.sha1()
+    for column in columns:
+        values = data_frame[column]
+        digest.update(f"{column!r}:{values.dtype};".encode())
+        if isinstance(values.dtype, np.dtype):
+            digest.update(np.ascontiguousarray(values.to_numpy()).data)
+        else:
+            digest.update(pd.util.hash_pandas_object(values, index=False).to_numpy().data)
+    return digest.hexdigest()
+
+
+def _outlier_matrix(data_frame, bounds, method):
+    """
+    Returns a boolean array with one row per row of `data_frame` and one column per column of
+    `bounds`, True where the value lies outside the bounds. Missing values are never outliers.
+    """
+    block = data_frame[list(bounds.index)].to_numpy(dtype=np.float64, na_value=np.nan)
+    lower, upper = bounds['lower'].to_numpy(), bounds['upper'].to_numpy()
+    with np.errstate(invalid='ignore'):
+        if method == 'iqr':
+            return (block < lower) | (block > upper)
+        # The z-score test keeps |z| < threshold, i.e. values strictly inside the bounds.
+        return np.abs(block - (lower + upper) / 2) >= (upper - lower) / 2
+
+
+def _numeric_column_profile(values, top_values=True):
+    """
+    Returns the moments, quantiles and (if `top_values`) distinct count and most frequent value of a
+    numeric column from one sort of its non-missing values: the quantiles are read off the sorted
+    array and the distinct values are its runs, so no hash table is built. Ties for the most frequent
+    value go to the smallest value.
+    """
+    values = np.sort(values[~np.isnan(values)])
+    count = len(values)
+    profile = dict.fromkeys(['mean', 'std', 'skew', 'min', 'q25', 'median', 'q75', 'max'], np.nan)
+    if top_values:
+        profile.update(distinct_count=0, top=None, top_frequency=np.nan)
+    if not count:
+        return profile
+
+    mean = values.sum() / count
+    centred = values - mean
+    squared = centred * centred
+    m2 = squared.sum() / count
+    m3 = (squared * centred).sum() / count
+    if count > 1:
+        profile['std'] = np.sqrt(m2 * count / (count - 1))
+    if count > 2:
+        # Adjusted Fisher-Pearson coefficient, as computed by `Series.skew`.
+        profile['skew'] = np.sqrt(count * (count - 1)) / (count - 2) * m3 / m2 ** 1.5 if m2 > 0 else 0.0
+    # Linear interpolation between the closest ranks, as `Series.quantile` does by default.
+    position = np.array([0, 0.25, 0.5, 0.75, 1]) * (count - 1)
+    below = np.floor(position).astype(np.int64)
+    above = np.minimum(below + 1, count - 1)
+    quantiles = values[below] + (values[above] - values[below]) * (position - below)
+    profile.update(zip(['min', 'q25', 'median', 'q75', 'max'], quantiles))
+    profile['mean'] = mean
+
+    if top_values:
+        starts = np.flatnonzero(np.concatenate([[True], values[1:] != values[:-1]]))
+        lengths = np.diff(np.append(starts, count))
+        most = np.argmax(lengths)
+        profile.update(distinct_count=len(starts), top=values[starts[most]], top_frequency=lengths[most])
+    return profile
+
 
 class DataTransform:
     def __init__(self, data_frame):
@@ -16,7 +230,7 @@ class DataTransform:
         """
         self.data_frame = data_frame
 
-    def convert_to_datetime(self, column):
+    def convert_to_datetime(self, column, format=None):
         """
         The function `convert_to_datetime` converts a column in a DataFrame to datetime format using the
         pandas library in Python.
@@ -25,10 +239,12 @@ class DataTransform:
         column in the DataFrame that you want to convert to datetime format. When you call this method,
         you pass the name of the column as an argument, and the method will convert the values in that
         column to datetime
+        :param format: Optional explicit `strftime` format (e.g. '%b-%Y'), which avoids inferring the
+        format of each value
         :return: The function `convert_to_datetime` returns the updated DataFrame after converting the
         specified column to datetime format using `pd.to_datetime`.
         """
-        self.data_frame[column] = pd.to_datetime(self.data_frame[column])
+        self.data_frame[column] = pd.to_datetime(self.data_frame[column], format=format)
         return self.data_frame
 
     def convert_to_numeric(self, column):
@@ -74,15 +290,254 @@ class DataTransform:
         :return: The `data_frame` with the specified symbols removed from the specified column is being
         returned.
         """
-        for symbol in symbols:
-            self.data_frame[column] = self.data_frame[column].str.replace(symbol, '')
+        self.data_frame[column] = _remove_symbols(self.data_frame[column], symbols)
+        return self.data_frame
+
+    def apply_schema(self, schema):
+        """
+        The function `apply_schema` converts every column named in `schema` in a single pass: symbols
+        are stripped, the column is converted to its target dtype (datetimes with an explicit format
+        rather than per-value inference) and all converted columns are written back to the DataFrame
+        together. Columns missing from the DataFrame are skipped.
+        
+        Values that cannot be converted become missing, as with `convert_to_numeric`. The time taken
+        and the number of such conversion failures are logged for each column and kept in
+        `self.conversion_report`.
+        
+        :param schema: Dictionary mapping column names to a specification with a `dtype` ('datetime',
+        'numeric', 'category' or any dtype accepted by `astype`), an optional datetime `format` and
+        optional `symbols` to remove, e.g. `LOAN_PAYMENTS_SCHEMA`.
+        :return: The DataFrame with the converted columns.
+        """
+        converted = {}
+        report = []
+        for column, spec in schema.items():
+            if column not in self.data_frame.columns:
+                logger.debug("Skipping %s: not in DataFrame", column)
+                continue
+
+            start = time.perf_counter()
+            original = self.data_frame[column]
+            values = _remove_symbols(original, spec['symbols']) if spec.get('symbols') else original
+            dtype = spec.get('dtype')
+            if dtype == 'datetime':
+                values = pd.to_datetime(values, format=spec.get('format'), errors='coerce')
+            elif dtype == 'numeric':
+                values = pd.to_numeric(values, errors='coerce')
+            elif dtype is not None:
+                values = values.astype(dtype)
+
+            failures = int((original.notna() & values.isna()).sum())
+            seconds = time.perf_counter() - start
+            converted[column] = values
+            report.append({'column': column, 'dtype': str(values.dtype), 'failures': failures, 'seconds': seconds})
+            logger.info("Converted %s to %s in %.3fs (%d conversion failures)", column, values.dtype, seconds, failures)
+
+        for column, values in converted.items():
+            self.data_frame[column] = values
+        self.conversion_report = pd.DataFrame(report, columns=['column', 'dtype', 'failures', 'seconds'])
         return self.data_frame
 
   
+def _plain_value(value):
+    """
+    Converts a value of a profile to a plain Python value JSON can hold.
+    """
+    if isinstance(value, (np.datetime64, np.timedelta64)):
+        value = pd.Timestamp(value) if isinstance(value, np.datetime64) else pd.Timedelta(value)
+    elif isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+class DataFrameProfile:
+    def __init__(self, summary, n_rows):
+        """
+        A column-by-column profile of a DataFrame, as produced by `DataFrameInfo.profile`.
+        
+        :param summary: DataFrame indexed by column name with the dtype, null count and percentage,
+        distinct count, most frequent value and its frequency, and for numeric columns the mean,
+        standard deviation, skewness, minimum, quartiles and maximum.
+        :param n_rows: Number of rows in the profiled DataFrame.
+        """
+        self.summary = summary
+        self.n_rows = n_rows
+
+    def null_counts(self):
+        """
+        Return the count and percentage of NULL values in each column, as `count_null_values` does.
+        """
+        return self.summary[['null_count', 'null_percentage']]
+
+    def statistics(self):
+        """
+        Return the mean, median and standard deviation of the numeric columns, as `get_statistics` does.
+        """
+        numeric = self.summary[self.summary['numeric']]
+        return {'mean': numeric['mean'], 'median': numeric['median'], 'std_dev': numeric['std']}
+
+    def distinct_counts(self):
+        """
+        Return the number of distinct values in each column.
+        """
+        return self.summary['distinct_count'].to_dict()
+
+    def to_frame(self):
+        """
+        Return a copy of the summary DataFrame.
+        """
+        return self.summary.copy()
+
+    def to_dict(self):
+        """
+        Return the profile as plain Python values, e.g. for serialising it to JSON or YAML. Dates and
+        times are given in ISO format, and any other value JSON cannot hold as a string.
+        """
+        summary = self.summary.astype(object).where(self.summary.notna(), None)
+        return {
+            'n_rows': int(self.n_rows),
+            'columns': {
+                column: {key: _plain_value(value) for key, value in row.items()}
+                for column, row in summary.to_dict(orient='index').items()
+            },
+        }
+
+
+# Number of set bits in each byte value, for counting the bits of a packed mask.
+_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+class NullProfile:
+    def __init__(self, columns, packed_mask, n_rows):
+        """
+        A snapshot of where the NULL values of a DataFrame are, as produced by `NullProfile.capture`.
+        The mask is stored bit-packed along the rows (one bit per cell), so snapshots taken before and
+        after a transform are cheap to keep and compare.
+        
+        :param columns: Index of the column names.
+        :param packed_mask: Array of shape (ceil(n_rows / 8), n_columns) from `np.packbits`.
+        :param n_rows: Number of rows in the DataFrame.
+        """
+        self.columns = columns
+        self.packed_mask = packed_mask
+        self.n_rows = n_rows
+        self.counts = pd.Series(_POPCOUNT[packed_mask].sum(axis=0, dtype=np.int64), index=columns, dtype=np.int64)
+
+    @classmethod
+    def capture(cls, data_frame):
+        """
+        Build a snapshot from one null-mask pass over the DataFrame. Each column's mask is packed as
+        soon as it is computed, so only one column is held unpacked at a time.
+        
+        :param data_frame: DataFrame to scan.
+        :return: A `NullProfile`.
+        """
+        n_rows = len(data_frame)
+        packed_mask = np.empty(((n_rows + 7) // 8, len(data_frame.columns)), dtype=np.uint8)
+        for index in range(len(data_frame.columns)):
+            packed_mask[:, index] = np.packbits(data_frame.iloc[:, index].isna().to_numpy(dtype=bool))
+        return cls(data_frame.columns, packed_mask, n_rows)
+
+    def null_counts(self):
+        """
+        Return the count and percentage of NULL values in each column, as `count_null_values` does.
+        """
+        percentages = self.counts / self.n_rows * 100 if self.n_rows else self.counts * 0.0
+        return pd.DataFrame({'null_count': self.counts, 'null_percentage': percentages})
+
+    def to_dict(self):
+        """
+        Return the count of NULL values in each column, as `check_null_values` does.
+        """
+        return {column: int(count) for column, count in self.counts.items()}
+
+    def mask(self, column):
+        """
+        Return the boolean NULL mask of one column.
+        """
+        bits = np.unpackbits(self.packed_mask[:, self.columns.get_loc(column)], count=self.n_rows)
+        return bits.astype(bool)
+
+    def rows_with_nulls(self):
+        """
+        Return the number of rows with at least one NULL value.
+        """
+        if not len(self.columns):
+            return 0
+        return int(_POPCOUNT[np.bitwise_or.reduce(self.packed_mask, axis=1)].sum(dtype=np.int64))
+
+    def compare(self, other):
+        """
+        Compare the NULL counts of this snapshot with those of a later one, e.g. taken after imputation.
+        Columns missing from either snapshot count as having no NULL values there.
+        
+        :param other: The later `NullProfile`.
+        :return: DataFrame with the 'before', 'after' and 'change' counts of each column.
+        """
+        columns = self.columns.append(other.columns.difference(self.columns, sort=False))
+        before = self.counts.reindex(columns, fill_value=0)
+        after = other.counts.reindex(columns, fill_value=0)
+        return pd.DataFrame({'before': before, 'after': after, 'change': after - before})
+
+
 class DataFrameInfo:
     def __init__(self, data_frame):
         self.data_frame = data_frame
 
+    def profile(self, top_values=True):
+        """
+        The function `profile` computes nulls, moments, quantiles, distinct counts and the most
+        frequent value of every column in one pass over the DataFrame: a single null mask for all
+        columns, one sort of each numeric column from which its moments, quantiles, distinct values and
+        most frequent value are all read, and one value count per other column. Keep the returned
+        profile to reuse it; each call rescans the DataFrame, so the profile always reflects its
+        current values.
+        
+        :param top_values: Whether to compute distinct counts and most frequent values, which needs one
+        hash pass per non-numeric column.
+        :return: A `DataFrameProfile`.
+        """
+        data_frame = self.data_frame
+        n_rows = len(data_frame)
+        null_count = NullProfile.capture(data_frame).counts
+        summary = pd.DataFrame({
+            'dtype': data_frame.dtypes.astype(str),
+            'null_count': null_count,
+            'null_percentage': null_count / n_rows * 100 if n_rows else 0.0,
+        })
+
+        # Selecting the columns by dtype rather than with `select_dtypes`, which copies them.
+        numeric_columns = pd.Index([column for column, dtype in data_frame.dtypes.items()
+                                    if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)])
+        summary['numeric'] = summary.index.isin(numeric_columns)
+        for statistic in ['mean', 'std', 'skew', 'min', 'q25', 'median', 'q75', 'max', 'distinct_count']:
+            summary[statistic] = np.nan
+        summary['top'] = None
+        summary['top_frequency'] = np.nan
+        for column in numeric_columns:
+            profile = _numeric_column_profile(data_frame[column].to_numpy(dtype=np.float64, na_value=np.nan),
+                                              top_values)
+            if profile.get('top') is not None and pd.api.types.is_integer_dtype(data_frame[column].dtype):
+                profile['top'] = int(profile['top'])
+            for statistic, value in profile.items():
+                summary.at[column, statistic] = value
+
+        if top_values:
+            for column in data_frame.columns.difference(numeric_columns, sort=False):
+                counts = data_frame[column].value_counts(sort=True)
+                # Categorical columns also count their unused categories, with a count of 0.
+                counts = counts[counts > 0]
+                summary.at[column, 'distinct_count'] = len(counts)
+                if len(counts):
+                    summary.at[column, 'top'] = counts.index[0]
+                    summary.at[column, 'top_frequency'] = counts.iloc[0]
+
+        return DataFrameProfile(summary, n_rows)
+
     def describe_columns(self):
         """
         Describe all columns in the DataFrame to check their data types and summary statistics.
@@ -94,9 +549,9 @@ class DataFrameInfo:
         Extract statistical values: median, standard deviation, and mean from the numeric columns.
         """
         stats = {
-            'mean': self.data_frame.mean(),
-            'median': self.data_frame.median(),
-            'std_dev': self.data_frame.std()
+            'mean': self.data_frame.mean(numeric_only=True),
+            'median': self.data_frame.median(numeric_only=True),
+            'std_dev': self.data_frame.std(numeric_only=True)
         }
         return stats
 
@@ -118,9 +573,7 @@ class DataFrameInfo:
         """
         Generate a count and percentage count of NULL values in each column.
         """
-        null_counts = self.data_frame.isnull().sum()
-        null_percentages = self.data_frame.isnull().mean() * 100
-        return pd.DataFrame({'null_count': null_counts, 'null_percentage': null_percentages})
+        return NullProfile.capture(self.data_frame).null_counts()
 
     def value_counts(self, column):
         """
@@ -132,14 +585,21 @@ class DataFrameInfo:
 class DataFrameTransform:
     def __init__(self, data_frame):
         self.data_frame = data_frame
-        
+        self._correlation_cache = None
+        self._correlation_key = None
+        self.skew_transformations = {}
+        self.null_profile_before = None
+        self.null_profile_after = None
+
     def check_null_values(self):
         """
-        Check for NULL values in each column of the DataFrame.
+        Check for NULL values in each column of the DataFrame. The snapshot is kept as
+        `null_profile_before`, e.g. for `Plotter.plot_null_values`.
         
         :return: Dictionary containing count of NULL values for each column.
         """
-        return self.data_frame.isnull().sum().to_dict()
+        self.null_profile_before = NullProfile.capture(self.data_frame)
+        return self.null_profile_before.to_dict()
     
     def drop_columns(self, columns_to_drop):
         """
@@ -168,11 +628,13 @@ class DataFrameTransform:
     
     def check_null_values_after(self):
         """
-        Check for NULL values in each column of the DataFrame after imputation.
+        Check for NULL values in each column of the DataFrame after imputation. The snapshot is kept as
+        `null_profile_after`.
         
         :return: Dictionary containing count of NULL values for each column after imputation.
         """
-        return self.data_frame.isnull().sum().to_dict()
+        self.null_profile_after = NullProfile.capture(self.data_frame)
+        return self.null_profile_after.to_dict()
     
     def identify_skewed_columns(self, skew_threshold=0.75):
         """
@@ -193,6 +655,8 @@ class DataFrameTransform:
         return skewed_columns
     
     def apply_transformation(self, col, transformation):
+        import scipy.stats
+
         if transformation == 'log':
             return np.log1p(self.data_frame[col])
         elif transformation == 'sqrt':
@@ -241,15 +705,95 @@ class DataFrameTransform:
             if col in self.data_frame.select_dtypes(include=['number']).columns:
                 self.data_frame[col] = np.log1p(self.data_frame[col])
 
+    def fit_skew_transformations(self, columns=None, sample_size=100000, max_workers=None):
+        """
+        The function `fit_skew_transformations` chooses the log, sqrt or Box-Cox transformation that
+        minimises the skewness of each column, evaluating the columns in parallel across a process
+        pool. Each column is scored on a stratified sample of at most `sample_size` values, and the
+        fitted parameters (such as the Box-Cox lambda) are kept so the same transformation can be
+        reapplied to new data without refitting.
+        
+        :param columns: Columns to fit, defaults to the columns from `identify_skewed_columns`.
+        :param sample_size: Maximum number of values per column used for scoring and fitting.
+        :param max_workers: Number of worker processes; 1 evaluates the columns in this process.
+        :return: Dictionary mapping each column to its fitted parameters, also stored in
+        `self.skew_transformations`. Columns that no transformation applies to, or that none makes
+        at least 1% less skewed, are left out, as are columns with two or fewer distinct values.
+        """
+        if columns is None:
+            columns = self.identify_skewed_columns()
+        numeric_columns = self.data_frame.select_dtypes(include=['number']).columns
+        columns = [col for col in columns if col in numeric_columns]
+        samples = [_stratified_sample(self.data_frame[col].to_numpy(dtype=np.float64, na_value=np.nan), sample_size)
+                   for col in columns]
+
+        if max_workers == 1 or len(columns) <= 1:
+            results = [_select_transformation(sample) for sample in samples]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_select_transformation, samples))
+
+        self.skew_transformations = {col: params for col, params in zip(columns, results) if params is not None}
+        return self.skew_transformations
+
+    def apply_skew_transformations(self, transformations=None):
+        """
+        Apply fitted skew transformations to their columns in one batch.
+        
+        :param transformations: Dictionary as returned by `fit_skew_transformations`, defaults to the
+        one stored by the last fit.
+        :return: The transformed DataFrame.
+        """
+        if transformations is None:
+            transformations = self.skew_transformations
+        transformed = {
+            col: _apply_fitted_transformation(self.data_frame[col].to_numpy(dtype=np.float64, na_value=np.nan), params)
+            for col, params in transformations.items() if col in self.data_frame.columns
+        }
+        for col, values in transformed.items():
+            self.data_frame[col] = values
+        return self.data_frame
+
+    def correct_skewness(self, columns=None, sample_size=100000, max_workers=None):
+        """
+        Fit the best skew transformation for each column with `fit_skew_transformations` and apply it.
+        
+        :return: Dictionary mapping each transformed column to its fitted parameters.
+        """
+        transformations = self.fit_skew_transformations(columns, sample_size=sample_size, max_workers=max_workers)
+        self.apply_skew_transformations(transformations)
+        return transformations
+
+    def render_report(self, output_dir, columns=None, charts=('boxplot', 'histogram', 'skewness'), **kwargs):
+        """
+        Render the outlier and skewness charts of `plot_outliers` and `visualize_skewness` to files
+        without displaying them; see `Plotter.render_report`.
+        
+        :param output_dir: Directory the charts (and `report.html`) are written to.
+        :param columns: Columns to chart, defaults to all numerical columns.
+        :param charts: Kinds of chart to render for each column.
+        :return: Path of the HTML report, or the list of chart paths if `html_report` is False.
+        """
+        from plotting import Plotter
+
+        return Plotter(self.data_frame).render_report(output_dir, columns=columns, charts=charts, **kwargs)
+
     def visualize_skewness(self, columns):
-        for col in columns:
-            plt.figure(figsize=(10, 6))
-            sns.histplot(self.data_frame[col], kde=True)
-            plt.title(f'Skewness of {col}: {self.data_frame[col].skew():.2f}')
-            plt.show()
+        from plotting import Plotter
+
+        Plotter(self.data_frame).plot_skewness(columns)
   
     def save_dataframe(self, path):
-        self.data_frame.to_csv(path, index=False)
+        """
+        Save the DataFrame without its index, as Parquet for a `.parquet` / `.pq` path (keeping the
+        column dtypes) and as CSV otherwise.
+        
+        :param path: Destination path.
+        """
+        if str(path).lower().endswith(('.parquet', '.pq')):
+            self.data_frame.to_parquet(path, engine='pyarrow', index=False)
+        else:
+            self.data_frame.to_csv(path, index=False)
 
     def plot_outliers(self, columns=None):
         """
@@ -263,11 +807,43 @@ class DataFrameTransform:
         if columns is None:
             columns = self.data_frame.select_dtypes(include=['number']).columns
         
+        from plotting import Plotter
+
         plotter = Plotter(self.data_frame)
         plotter.plot_boxplot(columns)
         plotter.plot_histogram(columns)
     
-    def remove_outliers(self, columns=None, method='iqr', threshold=1.5):
+    def compute_outlier_bounds(self, columns=None, method='iqr', threshold=1.5):
+        """
+        The function `compute_outlier_bounds` computes the outlier bounds of all the given numerical
+        columns in one vectorised pass over the numeric block.
+        
+        :param columns: Columns to compute bounds for, defaults to all numerical columns.
+        :param method: 'iqr' for `[q1 - threshold * iqr, q3 + threshold * iqr]`, or 'z-score' for
+        `mean -/+ threshold * std`.
+        :param threshold: Multiplier of the IQR or of the standard deviation.
+        :return: DataFrame indexed by column with `lower` and `upper` bounds.
+        """
+        if columns is None:
+            columns = self.data_frame.select_dtypes(include=['number']).columns
+        columns = list(columns)
+        block = self.data_frame[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            if method == 'iqr':
+                q1, q3 = np.nanquantile(block, [0.25, 0.75], axis=0)
+                iqr = q3 - q1
+                lower, upper = q1 - threshold * iqr, q3 + threshold * iqr
+            elif method == 'z-score':
+                mean = np.nanmean(block, axis=0)
+                std = np.nanstd(block, axis=0, ddof=1)
+                lower, upper = mean - threshold * std, mean + threshold * std
+            else:
+                raise ValueError("Unsupported method. Use 'iqr' or 'z-score'.")
+        return pd.DataFrame({'lower': lower, 'upper': upper}, index=pd.Index(columns))
+
+    def remove_outliers(self, columns=None, method='iqr', threshold=1.5, mode='sequential'):
         """
         The function `remove_outliers` takes a DataFrame and removes outliers from specified numerical
         columns using either the IQR method or z-score method based on the chosen threshold.
@@ -282,10 +858,33 @@ class DataFrameTransform:
         away from the median or quartiles a data point must be to be considered an outlier. It is used
         in conjunction with the chosen method ('iqr' or 'z-score') to define the boundaries for
         identifying outliers in
+        :param mode: 'sequential' filters the DataFrame one column at a time, so each column's bounds
+        are computed on the rows kept by the previous columns (and rows with missing values are
+        dropped). The other modes compute every column's bounds on the full DataFrame with
+        `compute_outlier_bounds`, combine them into a single row mask, treat missing values as
+        non-outliers and store the mask in `self.outlier_mask` (True for rows to keep): 'drop' removes
+        the outlying rows in one step, 'flag' adds a boolean `is_outlier` column instead, and 'mask'
+        leaves the DataFrame unchanged.
+        :return: For every mode except 'sequential', a Series with the number of outliers in each column.
         """
         if columns is None:
             columns = self.data_frame.select_dtypes(include=['number']).columns
-        
+
+        if mode != 'sequential':
+            if mode not in ('drop', 'flag', 'mask'):
+                raise ValueError("Unsupported mode. Use 'sequential', 'drop', 'flag' or 'mask'.")
+            bounds = self.compute_outlier_bounds(columns, method=method, threshold=threshold)
+            outliers = _outlier_matrix(self.data_frame, bounds, method)
+            keep = ~outliers.any(axis=1)
+
+            self.outlier_bounds = bounds
+            self.outlier_mask = pd.Series(keep, index=self.data_frame.index)
+            if mode == 'drop':
+                self.data_frame = self.data_frame[keep]
+            elif mode == 'flag':
+                self.data_frame['is_outlier'] = ~keep
+            return pd.Series(outliers.sum(axis=0), index=bounds.index)
+
         for col in columns:
             if method == 'iqr':
                 q1 = self.data_frame[col].quantile(0.25)
@@ -313,17 +912,46 @@ class DataFrameTransform:
         if columns is None:
             columns = self.data_frame.select_dtypes(include=['number']).columns
         
+        from plotting import Plotter
+
         plotter = Plotter(self.data_frame)
         plotter.plot_boxplot(columns)
         plotter.plot_histogram(columns)
 
-    def compute_correlation_matrix(self):
+    def compute_correlation_matrix(self, chunk_size=100000, use_cache=True):
         """
         Compute the correlation matrix for numerical columns in the dataset.
+        
+        The matrix is built with a `CorrelationAccumulator` (standardised float32 blocks of `chunk_size`
+        rows reduced with BLAS matrix products) and cached under a hash of the numeric columns'
+        contents, so it is recomputed whenever their values change, however they were modified.
+        Checking the hash still reads every numeric value: a cache hit costs about a fifth of a full
+        computation (0.11s against 0.5s at 1M rows x 29 columns), so the cache pays off for repeated
+        calls such as `visualize_correlation_matrix` followed by `remove_highly_correlated_columns`.
+        
+        :param chunk_size: Number of rows standardised at a time, bounding the extra memory used.
+        :param use_cache: Whether to look up and store the matrix in the cache; pass False for a
+        one-off computation to skip hashing the columns.
         """
-        numeric_columns = self.data_frame.select_dtypes(include=['number'])
-        corr_matrix = numeric_columns.corr()
-        return corr_matrix
+        numeric_columns = pd.Index([column for column, dtype in self.data_frame.dtypes.items()
+                                    if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)])
+        key = _columns_fingerprint(self.data_frame, numeric_columns) if use_cache else None
+        if key is not None and self._correlation_cache is not None and self._correlation_key == key:
+            return self._correlation_cache
+
+        accumulator = CorrelationAccumulator(numeric_columns)
+        for start in range(0, len(self.data_frame), chunk_size):
+            accumulator.update(self.data_frame.iloc[start:start + chunk_size])
+        correlation = accumulator.correlation()
+        if use_cache:
+            self._correlation_cache, self._correlation_key = correlation, key
+        return correlation
+
+    def clear_correlation_cache(self):
+        """
+        Discard the cached correlation matrix.
+        """
+        self._correlation_cache = None
     
     
     def visualize_correlation_matrix(self):
@@ -331,11 +959,9 @@ class DataFrameTransform:
         The function `visualize_correlation_matrix` generates a heatmap visualization of the correlation
         matrix with annotations and specific color mapping.
         """   
-        corr_matrix = self.compute_correlation_matrix()
-        plt.figure(figsize=(10, 8))
-        sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', fmt=".2f", vmin=-1, vmax=1)
-        plt.title("Correlation Matrix Heatmap")
-        plt.show()
+        from plotting import Plotter
+
+        Plotter.plot_correlation_matrix(self.compute_correlation_matrix())
     
     def remove_highly_correlated_columns(self, threshold=0.8):
         """
@@ -344,106 +970,139 @@ class DataFrameTransform:
         
         :param threshold: The `threshold` parameter in the `remove_highly_correlated_columns` function
         represents the maximum correlation value between two columns that is considered to be highly
-        correlated. Any pair of columns with a correlation value greater than this threshold will be
-        identified as highly correlated and one of them will be dropped from the DataFrame
+        correlated. Any pair of columns whose absolute correlation is greater than this threshold will be
+        identified as highly correlated and one of them will be dropped from the DataFrame (see
+        `find_correlated_columns`)
         :return: The function `remove_highly_correlated_columns` returns a list of column names that
         were dropped from the DataFrame due to high correlation with other columns above the specified
         threshold.
         """
       
-        corr_matrix = self.compute_correlation_matrix()
-        upper_tri = corr_matrix.where(np.triu(np.ones(corr_matrix.shape), k=1).astype(bool))
-        to_drop = [column for column in upper_tri.columns if any(upper_tri[column] > threshold)]
-        
+        to_drop = self.find_correlated_columns(threshold)
         self.data_frame.drop(to_drop, axis=1, inplace=True)
         return to_drop
+
+    def find_correlated_columns(self, threshold=0.8, use_cache=True):
+        """
+        Greedily select the numerical columns to drop so that no two remaining columns have an absolute
+        correlation above `threshold`: columns are visited in order and a column is dropped if it is
+        too strongly correlated, positively or negatively, with a column already kept.
+        
+        :param threshold: Maximum absolute correlation allowed between the remaining columns.
+        :param use_cache: Whether to use the cached correlation matrix, as for `compute_correlation_matrix`.
+        :return: List of the column names to drop.
+        """
+        corr_matrix = self.compute_correlation_matrix(use_cache=use_cache)
+        correlations = np.abs(np.nan_to_num(corr_matrix.to_numpy()))
+        kept = np.zeros(len(corr_matrix.columns), dtype=bool)
+        to_drop = []
+        for index, column in enumerate(corr_matrix.columns):
+            if np.any(correlations[index, kept] > threshold):
+                to_drop.append(column)
+            else:
+                kept[index] = True
+        return to_drop
     
     def testing_import(self, message):
         return f"Message received: {message}"
     
-class Plotter:
+class DataFrameOptimiser:
     def __init__(self, data_frame):
         self.data_frame = data_frame
+        self.original_dtypes = {}
+
+    def profile_memory(self):
+        """
+        Report the memory used by each column, including the contents of string values.
         
-    def plot_null_values(self):
-      
-        # `null_counts_before = self.data_frame.isnull().sum()` is a line of code within the
-        # `plot_null_values` method of the `Plotter` class. This line is calculating the count of NULL
-        # values in each column of the DataFrame before any removal or processing is done.
-        null_counts_before = self.data_frame.isnull().sum()
-    
-        
-       # The line `null_counts_after = self.data_frame.isnull().sum()` is calculating the count of
-       # NULL values in each column of the DataFrame after any removal or processing has been done.
-       # This line is used within the `plot_null_values` method of the `Plotter` class to compare the
-       # count of NULL values before and after any data manipulation.
-        null_counts_after = self.data_frame.isnull().sum()
+        :return: Series of bytes used per column.
+        """
+        return self.data_frame.memory_usage(index=False, deep=True)
+
+    def optimise(self, downcast_integers=True, downcast_floats=True, category_threshold=0.5, float_rtol=0,
+                 exclude=None):
+        """
+        The function `optimise` reduces the memory footprint of the DataFrame by downcasting each
+        column to the smallest dtype that holds its values: integers to the smallest (unsigned) integer
+        type, floats to float32 where every value survives the round trip within `float_rtol`, and
+        string columns with few distinct values to `category`. The original dtypes are recorded so
+        that `restore` can undo the changes.
         
-       
-        # The line `fig, ax = plt.subplots(figsize=(10, 6))` is creating a new figure and a set of
-        # subplots within that figure for plotting. Here's a breakdown of what each part does:
-        fig, ax = plt.subplots(figsize=(10, 6))
-      
+        :param downcast_integers: Whether to downcast integer columns; this is always lossless.
+        :param downcast_floats: Whether to downcast float64 columns to float32.
+        :param category_threshold: Maximum ratio of distinct values to rows for a string column to be
+        converted to `category`. Use 0 to disable.
+        :param float_rtol: Maximum relative error allowed when downcasting floats; columns whose values
+        do not fit are left as float64. The default of 0 only downcasts floats that are exactly
+        representable, so `restore` gives back the original values; a positive tolerance such as 1e-6
+        saves more memory but makes the downcast lossy.
+        :param exclude: Optional list of columns to leave unchanged.
+        :return: DataFrame with the dtype and bytes used before and after for each changed column, and
+        the bytes saved.
+        """
+        exclude = set(exclude or [])
+        before = self.profile_memory()
+        converted = {}
+
+        for column in self.data_frame.columns:
+            if column in exclude:
+                continue
+            values = self.data_frame[column]
+            dtype = values.dtype
+            result = None
+
+            if downcast_integers and pd.api.types.is_integer_dtype(dtype) and not pd.api.types.is_extension_array_dtype(dtype):
+                result = pd.to_numeric(values, downcast='unsigned' if len(values) and values.min() >= 0 else 'integer')
+            elif downcast_floats and dtype == np.float64:
+                candidate = values.astype(np.float32)
+                finite = np.isfinite(values.to_numpy())
+                if np.all(np.isfinite(candidate.to_numpy()[finite])) and np.allclose(
+                        candidate.to_numpy(dtype=np.float64), values.to_numpy(), rtol=float_rtol, atol=0, equal_nan=True):
+                    result = candidate
+            elif category_threshold and (dtype == object or pd.api.types.is_string_dtype(dtype)):
+                if len(values) and values.nunique() <= category_threshold * len(values):
+                    result = values.astype('category')
 
-       # The line `bar_width = 0.35` in the `Plotter` class is setting the width of the bars in a bar
-       # plot that will be created later in the `plot_null_values` method.
-        bar_width = 0.35
-        
-       
-       # In the provided code snippet, the line `indices = range(len(null_counts_before))` is creating
-       # a range of indices based on the length of the `null_counts_before` Series object.
-        indices = range(len(null_counts_before))
-        
-       
-        # The code snippet `rects1 = ax.bar(indices, null_counts_before, bar_width, label='Before
-        # Removal')` and `rects2 = ax.bar([i + bar_width for i in indices], null_counts_after,
-        # bar_width, label='After Removal')` in the `Plotter` class is creating two sets of bar plots
-        # on the same figure to visually compare the count of NULL values before and after any removal
-        # or processing has been done on the DataFrame.
-        global rects1, rects2
-        rects1 = ax.bar(indices, null_counts_before, bar_width, label='Before Removal')
-        rects2 = ax.bar([i + bar_width for i in indices], null_counts_after, bar_width, label='After Removal')
-        
-       
-        # In the provided code snippet, the lines `ax.set_xticks([i + bar_width / 2 for i in
-        # indices])` and `ax.set_xticklabels(null_counts_before.index, rotation=45)` are setting the
-        # positions and labels for the x-axis ticks on the plot created within the `Plotter` class.
-        ax.set_xticks([i + bar_width / 2 for i in indices])
-        ax.set_xticklabels(null_counts_before.index, rotation=45)
+            if result is not None and result.dtype != dtype:
+                converted[column] = result
+                self.original_dtypes.setdefault(column, dtype)
+
+        for column, values in converted.items():
+            self.data_frame[column] = values
+
+        after = self.profile_memory()
+        columns = list(converted)
+        report = pd.DataFrame({
+            'original_dtype': [str(self.original_dtypes[column]) for column in columns],
+            'new_dtype': [str(self.data_frame[column].dtype) for column in columns],
+            'bytes_before': before[columns].to_numpy(),
+            'bytes_after': after[columns].to_numpy(),
+        }, index=pd.Index(columns, name='column'))
+        report['bytes_saved'] = report['bytes_before'] - report['bytes_after']
+        return report
+
+    def restore(self, columns=None):
+        """
+        Restore the dtypes recorded by `optimise`. Integer, categorical and float columns are restored
+        exactly, unless floats were downcast with a positive `float_rtol`, in which case they come back
+        as float64 with the values rounded to float32.
         
-      
-        # The above code is setting the x-axis label to "Columns", the y-axis label to "Count of NULL
-        # Values", and the title of the plot to "Count of NULL Values Before and After Removal". This
-        # code is likely part of a data visualization task where the goal is to display the count of
-        # NULL values before and after removal in a plot.
-        ax.set_xlabel('Columns')
-        ax.set_ylabel('Count of NULL Values')
-        ax.set_title('Count of NULL Values Before and After Removal')
-        
-       
-        # The code is calling the `legend()` method on the `ax` object to display a legend on the
-        # plot, and then it is enabling the grid on the plot by setting `grid` property to `True`
-        # using the `grid()` method on the `ax` object.
-        ax.legend()
-        ax.grid(True)
-        
-        # The code is attempting to adjust the layout of the plot using `plt.tight_layout()` and then
-        # display the plot using `plt.show()`. However, the code is not properly formatted as the
-        # indentation is incorrect. The correct code should be:
-        plt.tight_layout()
-        plt.show()
-    
-    def plot_boxplot(self, columns):
-        for col in columns:
-            plt.figure(figsize=(8, 6))
-            sns.boxplot(x=self.data_frame[col])
-            plt.title(f'Boxplot of {col}')
-            plt.show()
+        :param columns: Optional list of columns to restore, defaults to every optimised column.
+        :return: The DataFrame with its original dtypes.
+        """
+        columns = list(self.original_dtypes) if columns is None else columns
+        for column in columns:
+            if column in self.data_frame.columns:
+                self.data_frame[column] = self.data_frame[column].astype(self.original_dtypes[column])
+            self.original_dtypes.pop(column, None)
+        return self.data_frame
 
-    def plot_histogram(self, columns):
-        for col in columns:
-            plt.figure(figsize=(8, 6))
-            sns.histplot(self.data_frame[col], bins=20, kde=True)
-            plt.title(f'Histogram of {col}')
-            plt.show()
 
+def __getattr__(name):
+    # `Plotter` lives in the `plotting` module, imported on first use so that importing this module
+    # does not load matplotlib and seaborn.
+    if name == 'Plotter':
+        from plotting import Plotter
+
+        return Plotter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")